@@ -0,0 +1,95 @@
+from __future__ import annotations
+from typing import Iterable, Optional, Union
+
+try:
+    import numpy as np
+except ImportError:     # numpy is an optional dependency
+    np = None
+
+from geometry.point import Point
+from geometry.point_array import PointArray
+
+# Points may be given as Points, a PointArray or an (N, 2) array of x, y
+Points = Union[Iterable[Point], PointArray, "np.ndarray"]
+
+
+def _as_coordinates(points: Points) -> np.ndarray:
+    """Return points as an (N, 2) array of x, y coordinates."""
+    if np is None:
+        raise ImportError("numpy is required for batch distance queries")
+
+    if isinstance(points, Point):
+        return np.array([[points.x, points.y]], dtype=float)
+
+    if isinstance(points, PointArray):
+        # PointArray buffers can be read by numpy without a copy
+        return np.column_stack((
+            np.frombuffer(points.xs, dtype=float), 
+            np.frombuffer(points.ys, dtype=float)
+        ))
+
+    if isinstance(points, np.ndarray):
+        return points.reshape(-1, 2).astype(float, copy=False)
+
+    return np.array(
+        [(point.x, point.y) for point in points], dtype=float
+    ).reshape(-1, 2)
+
+
+def distances_from(
+    origin: Point, 
+    points: Points, 
+    squared: bool=False
+) -> np.ndarray:
+    """Return the distance from an origin to each of many points.
+    
+    With squared set, the square root is skipped; this is cheaper and keeps
+    the order of the distances, so suits comparisons.
+    """
+    deltas = _as_coordinates(points) - (origin.x, origin.y)
+    squared_distances = np.einsum('ij,ij->i', deltas, deltas)
+    return squared_distances if squared else np.sqrt(squared_distances)
+
+
+def distance_matrix(
+    points_a: Points, 
+    points_b: Optional[Points]=None, 
+    squared: bool=False
+) -> np.ndarray:
+    """Return an (N, M) array of distances between two sets of points.
+    
+    If points_b isn't given, distances are between each pair in points_a.
+    """
+    coordinates_a = _as_coordinates(points_a)
+    coordinates_b = (
+        coordinates_a if points_b is None else _as_coordinates(points_b)
+    )
+
+    deltas = coordinates_a[:, np.newaxis, :] - coordinates_b[np.newaxis, :, :]
+    squared_distances = np.einsum('ijk,ijk->ij', deltas, deltas)
+    return squared_distances if squared else np.sqrt(squared_distances)
+
+
+def indices_within_radius(
+    centre: Point, 
+    points: Points, 
+    radius: float
+) -> np.ndarray:
+    """Return the indices of the points within a radius of a centre."""
+    # Comparing squared distances avoids taking any square roots
+    return np.flatnonzero(
+        distances_from(centre, points, squared=True) <= radius ** 2
+    )
+
+
+def k_nearest_indices(origin: Point, points: Points, k: int) -> np.ndarray:
+    """Return the indices of the k points nearest the origin, nearest first."""
+    squared_distances = distances_from(origin, points, squared=True)
+    k = min(k, len(squared_distances))
+
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+
+    # Partitioning finds the k nearest without sorting every distance
+    nearest = np.argpartition(squared_distances, k - 1)[:k]
+    return nearest[np.argsort(squared_distances[nearest], kind='stable')]
@@ -1,23 +1,38 @@
 from __future__ import annotations
-from typing import Optional, List, Tuple
+from typing import Iterator, Optional, List, Tuple
+from array import array
+from functools import cached_property
 import math
 
 from geometry.point import Point
 
 
 class Edge: 
+    """Immutable edge between two points; derived values are cached."""
     def __init__(self, origin: Point, termination: Point):
-        # TODO: may be better to reimplement some @properties
-        # It is not likely that they'll need to be recomputed once they've been
-        # calcualted for the first time; perhaps cached_property is better
+        object.__setattr__(self, "origin", origin)
+        object.__setattr__(self, "termination", termination)
 
-        self.origin = origin
-        self.termination = termination
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError("Edge is immutable.")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("Edge is immutable.")
 
     def __eq__(self, edge_2: Edge) -> bool:
-        """Check if two edges are the same."""
-        # TODO: this won't work if Edge.__contains__ is updated for point on line
-        return self.origin in edge_2 and self.termination in edge_2
+        """Check if two edges are the same (in either direction)."""
+        if not isinstance(edge_2, Edge):
+            return NotImplemented
+
+        return (
+            (self.origin == edge_2.origin and 
+             self.termination == edge_2.termination) or
+            (self.origin == edge_2.termination and 
+             self.termination == edge_2.origin)
+        )
+
+    def __hash__(self) -> int:
+        return hash(frozenset((self.origin, self.termination)))
 
     def __contains__(self, point: Point) -> bool:
         """Check if a given point occurs within the edge."""
@@ -31,45 +46,59 @@ class Edge:
     def __str__(self) -> str:
         return f"{self.origin} -> {self.termination}"
 
-    @property
+    @cached_property
     def x_diff(self) -> float:
         return self.termination.x - self.origin.x
     
-    @property
+    @cached_property
     def y_diff(self) -> float:
         return self.termination.y - self.origin.y
 
-    @property
+    @cached_property
     def y_intercept(self) -> float:
         """Return the y-intercept."""
         return self.origin.y - (self.gradient * self.origin.x)
 
-    @property
+    @cached_property
     def diagonal_distance(self) -> int: 
         """"""
         x_delta = self.origin.x - self.termination.x
         y_delta = self.origin.y - self.termination.y
         return max(abs(x_delta), abs(y_delta))
     
-    @property
+    @cached_property
     def length(self) -> float: 
         """Return the length of the edge."""
         return self.origin.distance_to(self.termination)
     
-    @property
+    @cached_property
     def angle(self) -> float:
         """"""
         return math.atan2(self.x_diff, self.y_diff)
 
-    @property
+    @cached_property
+    def bounding_box(self) -> Tuple[Point, Point]:
+        """Return the (minimum, maximum) corners of the edge's bounding box."""
+        return (
+            Point(
+                min(self.origin.x, self.termination.x), 
+                min(self.origin.y, self.termination.y)
+            ),
+            Point(
+                max(self.origin.x, self.termination.x), 
+                max(self.origin.y, self.termination.y)
+            )
+        )
+
+    @cached_property
     def is_vertical(self) -> bool: 
         return self.origin.x == self.termination.x
     
-    @property
+    @cached_property
     def is_horizontal(self) -> bool: 
         return self.origin.y == self.termination.y
     
-    @property
+    @cached_property
     def gradient(self) -> float: 
         """"""
         if self.is_vertical: 
@@ -80,7 +109,7 @@ class Edge:
         
         return self.y_diff / self.x_diff
 
-    @property
+    @cached_property
     def centre(self) -> Point:
         """Return the centre point of the edge."""
         mid_x = self.origin.x + (self.x_diff / 2)
@@ -93,19 +122,24 @@ class Edge:
         
         -1 denotes counterclock; 0 denotes vertical, and +1 denotes clock.
         """
-
-        # TODO: check if there is some repeatable way to calculate val at instance level
-        # TODO: also check if this interface can be improved (e.g. can it accept an edge+point)
-
-        edge_1 = Edge(point_b, point_a)
-        edge_2 = Edge(point_c, point_b)
-
-        val = (
-            (edge_1.y_diff * edge_2.x_diff) - 
-            (edge_1.x_diff * edge_2.y_diff)
+        return Edge.orientation_of_coordinates(
+            point_a.x, point_a.y, point_b.x, point_b.y, point_c.x, point_c.y
         )
 
-        if val > 1: 
+    @staticmethod
+    def orientation_of_coordinates(
+        a_x: float, 
+        a_y: float, 
+        b_x: float, 
+        b_y: float, 
+        c_x: float, 
+        c_y: float
+    ) -> int:
+        """Return the orientation of three points given as raw coordinates."""
+        # Cross product of (a - b) and (b - c)
+        val = ((a_y - b_y) * (b_x - c_x)) - ((a_x - b_x) * (b_y - c_y))
+
+        if val > 0: 
             return 1
         
         if val < 0: 
@@ -115,14 +149,42 @@ class Edge:
     
     def intersects(self, edge: Edge) -> bool:
         """Check if the current edge intersects another."""
-        # TODO: streamline
-        acd = Edge.orientation(self.origin, edge.origin, edge.termination)
-        bcd = Edge.orientation(self.termination, edge.origin, edge.termination)
-        abc = Edge.orientation(self.origin, self.termination, edge.origin)
-        abd = Edge.orientation(self.origin, self.termination, edge.termination)
+        a_x, a_y = self.origin.x, self.origin.y
+        b_x, b_y = self.termination.x, self.termination.y
+        c_x, c_y = edge.origin.x, edge.origin.y
+        d_x, d_y = edge.termination.x, edge.termination.y
+        orientation = Edge.orientation_of_coordinates
+
+        acd = orientation(a_x, a_y, c_x, c_y, d_x, d_y)
+        bcd = orientation(b_x, b_y, c_x, c_y, d_x, d_y)
+        abc = orientation(a_x, a_y, b_x, b_y, c_x, c_y)
+        abd = orientation(a_x, a_y, b_x, b_y, d_x, d_y)
 
         return acd != bcd and abc != abd
     
+    def intersection_point(self, edge: Edge) -> Optional[Point]:
+        """Return the point where the lines of two edges cross, if any.
+        
+        The lines are treated as unbounded; use intersects to check if the
+        edges themselves cross. None is returned for parallel lines.
+        """
+        denominator = (
+            (self.x_diff * edge.y_diff) - (self.y_diff * edge.x_diff)
+        )
+
+        if denominator == 0:
+            return None
+
+        step = (
+            ((edge.origin.x - self.origin.x) * edge.y_diff) - 
+            ((edge.origin.y - self.origin.y) * edge.x_diff)
+        ) / denominator
+
+        return Point(
+            self.origin.x + (step * self.x_diff), 
+            self.origin.y + (step * self.y_diff)
+        )
+
     def is_parallel_to(self, edge_2: Edge) -> bool: 
         """Check if the current edge is parallel to another."""
         if self.is_horizontal and edge_2.is_horizontal: 
@@ -140,19 +202,109 @@ class Edge:
         result = start + portion
         return round(result)
     
-    def intermediary_points(self, n_steps: Optional[int]=None) -> List[Point]:
-        """Return intermediary points between start and end."""
-        # TODO: perhaps could be a cached property
-        points = [self.origin, self.termination]
+    def traverse(self, supercover: bool=False) -> Iterator[Tuple[int, int]]:
+        """Yield the (x, y) grid cells along the edge, from origin to end.
         
-        if n_steps is None: 
-            n_steps = self.diagonal_distance
+        Uses integer-only Bresenham stepping, which gives one cell per step
+        along the longer axis. With supercover, every cell the edge touches 
+        is given instead (both neighbours where it passes through a corner).
+        """
+        x, y = round(self.origin.x), round(self.origin.y)
+        end_x, end_y = round(self.termination.x), round(self.termination.y)
+
+        x_step = 1 if end_x >= x else -1
+        y_step = 1 if end_y >= y else -1
+        x_delta = abs(end_x - x)
+        y_delta = abs(end_y - y)
+
+        yield x, y
+
+        if not supercover:
+            error = x_delta - y_delta
+
+            while x != end_x or y != end_y:
+                doubled_error = 2 * error
+
+                if doubled_error > -y_delta:
+                    error -= y_delta
+                    x += x_step
+
+                if doubled_error < x_delta:
+                    error += x_delta
+                    y += y_step
+
+                yield x, y
+            return
+
+        # Supercover: step along the major axis, adding the cell(s) passed 
+        # through whenever the minor axis changes
+        if x_delta >= y_delta:
+            major_delta, minor_delta = x_delta, y_delta
+        else:
+            major_delta, minor_delta = y_delta, x_delta
+
+        error = previous_error = major_delta
+
+        for _ in range(major_delta):
+            if x_delta >= y_delta:
+                x += x_step
+            else:
+                y += y_step
+
+            error += 2 * minor_delta
+
+            if error > 2 * major_delta:
+                if x_delta >= y_delta:
+                    y += y_step
+                    before_minor = (x, y - y_step)
+                    before_major = (x - x_step, y)
+                else:
+                    x += x_step
+                    before_minor = (x - x_step, y)
+                    before_major = (x, y - y_step)
+
+                error -= 2 * major_delta
+                corner = error + previous_error
+
+                if corner <= 2 * major_delta:
+                    yield before_minor
+                if corner >= 2 * major_delta:
+                    yield before_major
+
+            yield x, y
+            previous_error = error
+
+    def coordinates(self, supercover: bool=False) -> Tuple[array, array]:
+        """Return the x and y coordinates of the cells along the edge."""
+        xs = array('l')
+        ys = array('l')
+
+        for x, y in self.traverse(supercover):
+            xs.append(x)
+            ys.append(y)
+
+        return xs, ys
+
+    def intermediary_points(
+        self, 
+        n_steps: Optional[int]=None, 
+        supercover: bool=False
+    ) -> List[Point]:
+        """Return intermediary points between start and end (inclusive).
+        
+        By default these are the grid cells along the edge (see traverse);
+        with n_steps, n_steps + 1 evenly interpolated points are given.
+        """
+        if n_steps is None:
+            return [Point(x, y) for x, y in self.traverse(supercover)]
+
+        points = []
 
-        for step in range(1, n_steps + 1): 
+        for step in range(n_steps + 1): 
             t = step / n_steps
-            x = self._interpolate(self.origin.x, self.termination.x, t)
-            y = self._interpolate(self.origin.y, self.termination.y, t)
-            points.insert(-1, Point(x, y))
+            x = self.interpolate(self.origin.x, self.termination.x, t)
+            y = self.interpolate(self.origin.y, self.termination.y, t)
+            points.append(Point(x, y))
 
         return points
 
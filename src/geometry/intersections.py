@@ -0,0 +1,175 @@
+from typing import List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:     # numpy is an optional dependency
+    np = None
+
+from geometry.edge import Edge
+from geometry.point import Point
+from geometry.spatial_index import UniformGrid
+
+
+def _default_cell_size(edges: Sequence[Edge]) -> float:
+    """Return a grid cell size around the typical size of the edges."""
+    total = 0
+
+    for edge in edges:
+        minimum, maximum = edge.bounding_box
+        total += max(maximum.x - minimum.x, maximum.y - minimum.y)
+
+    return max(1, total / max(1, len(edges)))
+
+
+def _is_collinear(edge: Edge, other_edge: Edge) -> bool:
+    """Check whether both ends of the other edge lie on the edge's line."""
+    orientation = Edge.orientation
+    return (
+        orientation(edge.origin, edge.termination, other_edge.origin) == 0 and
+        orientation(edge.origin, edge.termination, other_edge.termination) == 0
+    )
+
+
+def _boxes_overlap(edge: Edge, other_edge: Edge) -> bool:
+    """Check whether the bounding boxes of two edges overlap (or touch)."""
+    minimum, maximum = edge.bounding_box
+    other_minimum, other_maximum = other_edge.bounding_box
+    return (
+        minimum.x <= other_maximum.x and other_minimum.x <= maximum.x and
+        minimum.y <= other_maximum.y and other_minimum.y <= maximum.y
+    )
+
+
+def edges_intersect(edge: Edge, other_edge: Edge) -> bool:
+    """Check whether two edges intersect, including collinear overlaps.
+    
+    Edge.intersects misses edges lying along the same line, where all of 
+    the orientations are 0; those intersect if their extents overlap.
+    """
+    if edge.intersects(other_edge):
+        return True
+
+    return _is_collinear(edge, other_edge) and _boxes_overlap(edge, other_edge)
+
+
+def _intersection_point(edge: Edge, other_edge: Edge) -> Optional[Point]:
+    """Return where two intersecting edges meet.
+    
+    Collinear edges only have a single point if they just touch end to end;
+    None is returned where they overlap.
+    """
+    if not _is_collinear(edge, other_edge):
+        return edge.intersection_point(other_edge)
+
+    # Compare the extents along the line's main axis
+    def position(point: Point) -> float:
+        return point.y if edge.is_vertical else point.x
+
+    ends = sorted((edge.origin, edge.termination), key=position)
+    other_ends = sorted((other_edge.origin, other_edge.termination), key=position)
+
+    if position(ends[1]) == position(other_ends[0]):
+        return ends[1]
+    if position(other_ends[1]) == position(ends[0]):
+        return ends[0]
+
+    return None
+
+
+def _intersecting_pairs(
+    edges: Sequence[Edge], 
+    targets: Sequence[Edge], 
+    pairs: List[Tuple[int, int]]
+) -> List[bool]:
+    """Test candidate (edge index, target index) pairs in one batch."""
+    if np is None:
+        return [
+            edges_intersect(edges[number], targets[other_number])
+            for number, other_number in pairs
+        ]
+
+    def ends(shapes: Sequence[Edge]) -> np.ndarray:
+        return np.array([
+            (edge.origin.x, edge.origin.y, edge.termination.x, edge.termination.y)
+            for edge in shapes
+        ], dtype=float).reshape(-1, 4)
+
+    numbers, other_numbers = np.array(pairs, dtype=np.intp).reshape(-1, 2).T
+    a_x, a_y, b_x, b_y = ends(edges)[numbers].T
+    c_x, c_y, d_x, d_y = ends(targets)[other_numbers].T
+
+    def orientation(p_x, p_y, q_x, q_y, r_x, r_y) -> np.ndarray:
+        # As Edge.orientation_of_coordinates, for whole arrays at once
+        return np.sign(((p_y - q_y) * (q_x - r_x)) - ((p_x - q_x) * (q_y - r_y)))
+
+    acd = orientation(a_x, a_y, c_x, c_y, d_x, d_y)
+    bcd = orientation(b_x, b_y, c_x, c_y, d_x, d_y)
+    abc = orientation(a_x, a_y, b_x, b_y, c_x, c_y)
+    abd = orientation(a_x, a_y, b_x, b_y, d_x, d_y)
+
+    crossing = (acd != bcd) & (abc != abd)
+    overlapping = (
+        (abc == 0) & (abd == 0) &
+        (np.minimum(a_x, b_x) <= np.maximum(c_x, d_x)) &
+        (np.minimum(c_x, d_x) <= np.maximum(a_x, b_x)) &
+        (np.minimum(a_y, b_y) <= np.maximum(c_y, d_y)) &
+        (np.minimum(c_y, d_y) <= np.maximum(a_y, b_y))
+    )
+
+    return (crossing | overlapping).tolist()
+
+
+def find_intersections(
+    edges: Sequence[Edge], 
+    other_edges: Optional[Sequence[Edge]]=None,
+    cell_size: Optional[float]=None,
+    with_points: bool=False
+) -> List[Tuple]:
+    """Return the (index, other index) pairs of edges which intersect.
+    
+    Without other_edges, each pair of edges in edges is checked once (with
+    index < other index). Otherwise edges are checked against other_edges,
+    e.g. projectile paths against walls. Edges are bucketed into a grid of 
+    cells, so only edges sharing a cell are tested, and the candidates are
+    tested together (vectorised, if numpy is available). Collinear edges 
+    which overlap count as intersecting; with_points adds the intersection 
+    point to each pair (None where collinear edges overlap).
+    """
+    targets = edges if other_edges is None else other_edges
+
+    grid = UniformGrid(
+        cell_size if cell_size is not None else _default_cell_size(targets)
+    )
+
+    for number, edge in enumerate(targets):
+        grid.insert(number, edge)
+
+    candidates = []
+
+    for number, edge in enumerate(edges):
+        minimum, maximum = edge.bounding_box
+
+        for other_number in sorted(grid.query_rect(minimum, maximum)):
+            if other_edges is None and other_number <= number:
+                continue
+
+            candidates.append((number, other_number))
+
+    output = []
+
+    for (number, other_number), intersects in zip(
+        candidates, _intersecting_pairs(edges, targets, candidates)
+    ):
+        if not intersects:
+            continue
+
+        if with_points:
+            output.append((
+                number, 
+                other_number, 
+                _intersection_point(edges[number], targets[other_number])
+            ))
+        else:
+            output.append((number, other_number))
+
+    return output
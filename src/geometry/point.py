@@ -2,16 +2,37 @@ from __future__ import annotations
 import math
 
 class Point: 
+    """Immutable, hashable 2D point."""
+    # Slots keep points small and make reading x / y a direct slot access
+    __slots__ = ("x", "y")
+
     def __init__(self, x: int, y: int):
-        self._x = x
-        self._y = y
+        object.__setattr__(self, "x", x)
+        object.__setattr__(self, "y", y)
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError("Point is immutable.")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("Point is immutable.")
+
+    def __reduce__(self):
+        return Point, (self.x, self.y)
 
     def __str__(self):
         return f"{self.x}, {self.y}"
 
+    def __repr__(self):
+        return f"Point({self.x!r}, {self.y!r})"
+
     def __eq__(self, point: Point) -> bool:
+        if not isinstance(point, Point):
+            return NotImplemented
         return self.x == point.x and self.y == point.y
 
+    def __hash__(self) -> int:
+        return hash((self.x, self.y))
+
     def __add__(self, point: Point) -> Point:
         return Point(self.x + point.x, self.y + point.y)
 
@@ -30,16 +51,6 @@ class Point:
     def scaled(self, scale_factor: float):
         return Point(self.x * scale_factor, self.y * scale_factor)
         
-    @property
-    def x(self) -> int: 
-        """Return the point X coordinate."""
-        return self._x  
-    
-    @property
-    def y(self) -> int: 
-        """Return the point Y coordinate."""
-        return self._y
-
     @property
     def distance_to_origin(self) -> float:
         """Return the distance to the origin (0, 0). Useful for sorting."""
@@ -0,0 +1,103 @@
+from __future__ import annotations
+from typing import Iterable, Iterator, Union
+from array import array
+from itertools import repeat
+import math
+import operator
+
+from geometry.point import Point
+
+class PointArray:
+    """Many points stored as contiguous arrays of x and y coordinates.
+    
+    Operations apply to every point at once without creating a Point per 
+    coordinate; the other operand may be a single Point (applied to every 
+    point) or a PointArray of the same length (applied pairwise).
+    """
+    def __init__(self, xs: Iterable[float]=(), ys: Iterable[float]=()):
+        self.xs = array('d', xs)
+        self.ys = array('d', ys)
+
+        if len(self.xs) != len(self.ys):
+            raise ValueError("xs and ys must be of equal length.")
+
+    @classmethod
+    def from_points(cls, points: Iterable[Point]) -> PointArray:
+        """Create an array from a series of Points."""
+        point_array = cls()
+
+        for point in points:
+            point_array.append(point)
+
+        return point_array
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def __getitem__(self, index: int) -> Point:
+        return Point(self.xs[index], self.ys[index])
+
+    def __iter__(self) -> Iterator[Point]:
+        return map(Point, self.xs, self.ys)
+
+    def __eq__(self, point_array: PointArray) -> bool:
+        if not isinstance(point_array, PointArray):
+            return NotImplemented
+        return self.xs == point_array.xs and self.ys == point_array.ys
+
+    def append(self, point: Point) -> None:
+        """Add a point to the end of the array."""
+        self.xs.append(point.x)
+        self.ys.append(point.y)
+
+    def _operands(self, other: Union[Point, PointArray]):
+        """Return the x and y operands for a Point or a PointArray."""
+        if isinstance(other, Point):
+            return repeat(other.x), repeat(other.y)
+
+        if len(other) != len(self):
+            raise ValueError("PointArrays must be of equal length.")
+
+        return other.xs, other.ys
+
+    def _apply(self, function, other: Union[Point, PointArray]) -> PointArray:
+        """Return a new array by applying a function to both coordinates."""
+        other_xs, other_ys = self._operands(other)
+        output = PointArray()
+        output.xs = array('d', map(function, self.xs, other_xs))
+        output.ys = array('d', map(function, self.ys, other_ys))
+        return output
+
+    def __add__(self, other: Union[Point, PointArray]) -> PointArray:
+        return self._apply(operator.add, other)
+
+    def __sub__(self, other: Union[Point, PointArray]) -> PointArray:
+        return self._apply(operator.sub, other)
+
+    def scaled(self, scale_factor: float) -> PointArray:
+        """Return a new array with every point scaled."""
+        return self._apply(operator.mul, Point(scale_factor, scale_factor))
+
+    def dot_product(self, other: Union[Point, PointArray]) -> array:
+        """Return the dot product of each point with another."""
+        other_xs, other_ys = self._operands(other)
+        return array(
+            'd', 
+            map(
+                operator.add, 
+                map(operator.mul, self.xs, other_xs),
+                map(operator.mul, self.ys, other_ys)
+            )
+        )
+
+    def distance_to(self, other: Union[Point, PointArray]) -> array:
+        """Return the distance from each point to another."""
+        other_xs, other_ys = self._operands(other)
+        return array(
+            'd', 
+            map(
+                math.hypot, 
+                map(operator.sub, self.xs, other_xs),
+                map(operator.sub, self.ys, other_ys)
+            )
+        )
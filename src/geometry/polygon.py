@@ -1,13 +1,101 @@
-from typing import Tuple
+from __future__ import annotations
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from bisect import bisect_right
+from functools import cached_property
+import math
+
+try:
+    import numpy as np
+except ImportError:     # numpy is an optional dependency
+    np = None
 
 from geometry.point import Point
 from geometry.edge import Edge
+from geometry.distance import Points, _as_coordinates
+
+# Upper limit on the (points x edges) working arrays of covers_points_array
+_MAX_BATCH_CELLS = 1 << 20
 
 class Polygon:
     def __init__(self, *points):
         self.points = points
         self.edges = ()
 
+    @property
+    def edges(self) -> Tuple[Edge]:
+        return self._edges
+
+    @edges.setter
+    def edges(self, edges: Tuple[Edge]) -> None:
+        self._edges = edges
+
+        # Derived values are recalculated for the new edges when needed
+        self.__dict__.pop("_crossing_coefficients", None)
+        self.__dict__.pop("_bounds", None)
+
+    @property
+    def vertices(self) -> Tuple[Point]:
+        """Return the polygon's vertices (from its edges, if it has any)."""
+        if self.edges:
+            return tuple(edge.origin for edge in self.edges)
+        return tuple(self.points)
+
+    @property
+    def bounding_box(self) -> Tuple[Point, Point]:
+        """Return the (minimum, maximum) corners of the polygon's bounding box."""
+        min_x, min_y, max_x, max_y = self._bounds
+        return Point(min_x, min_y), Point(max_x, max_y)
+
+    @cached_property
+    def _bounds(self) -> Tuple[float, float, float, float]:
+        """Return the bounding box as (min x, min y, max x, max y)."""
+        xs = [vertex.x for vertex in self.vertices]
+        ys = [vertex.y for vertex in self.vertices]
+        return min(xs), min(ys), max(xs), max(ys)
+
+    @property
+    def _outline(self) -> List[Tuple[Point, Point]]:
+        """Return the (start, end) of each edge, closing the outline."""
+        if self.edges:
+            return [(edge.origin, edge.termination) for edge in self.edges]
+
+        return [
+            (point, self.points[(number + 1) % len(self.points)])
+            for number, point in enumerate(self.points)
+        ]
+
+    @cached_property
+    def _crossing_coefficients(self) -> List[Tuple[float, float, float, float]]:
+        """Return (y min, y max, x at y min, dx/dy) for each non-flat edge."""
+        coefficients = []
+
+        for start, end in self._outline:
+            # Horizontal edges never cross a horizontal ray
+            if start.y == end.y:
+                continue
+
+            if start.y > end.y:
+                start, end = end, start
+
+            coefficients.append((
+                start.y, 
+                end.y, 
+                start.x, 
+                (end.x - start.x) / (end.y - start.y)
+            ))
+
+        return coefficients
+
+    def _crossings_at(self, y: float) -> List[float]:
+        """Return the sorted x positions where edges cross the line at y."""
+        # Each edge covers y_min <= y < y_max, so shared vertices count once
+        return sorted(
+            x_start + ((y - y_min) * inverse_gradient)
+            for y_min, y_max, x_start, inverse_gradient 
+            in self._crossing_coefficients
+            if y_min <= y < y_max
+        )
+
     @staticmethod
     def remove_redundant_points(*points: Point) -> Tuple[Point]:
         """Remove points in a series which aren't needed to plot a polygon."""
@@ -39,22 +127,163 @@ class Polygon:
 
         return tuple(output)
 
+    def _in_bounds(self, point: Point) -> bool:
+        min_x, min_y, max_x, max_y = self._bounds
+        return min_x <= point.x <= max_x and min_y <= point.y <= max_y
+
     def covers_point(self, point: Point) -> bool:
         """Check whether the polygon covers a specified point."""
         # TODO: this method probably should be on the Point
         # Moving it to Point (e.g. Point.is_inside(polygon)) would create a 
         # circular import - need to find a fix
-        off_chart_point = Point(-1, point.y)
-        intersect_edge = Edge(off_chart_point, point)
+        if not self.vertices or not self._in_bounds(point):
+            return False
 
-        crossed_edges = [
-            edge for edge in self.edges if edge.intersects(intersect_edge)
-        ]
+        # A ray from the left crosses the outline an odd number of times if 
+        # the point is inside
+        return bisect_right(self._crossings_at(point.y), point.x) % 2 == 1
 
-        for item in crossed_edges:
-            print(item)
+    def covers_points(self, points: Iterable[Point]) -> List[bool]:
+        """Check whether the polygon covers each of many points."""
+        if not self.vertices:
+            return [False for _ in points]
 
-        if len(crossed_edges) % 2 == 0:
-            return False
+        # Edge crossings are only worked out once per distinct row
+        crossings_by_row: Dict[float, List[float]] = {}
+        output = []
+
+        for point in points:
+            if not self._in_bounds(point):
+                output.append(False)
+                continue
+
+            crossings = crossings_by_row.get(point.y)
+            if crossings is None:
+                crossings = crossings_by_row[point.y] = self._crossings_at(
+                    point.y
+                )
+
+            output.append(bisect_right(crossings, point.x) % 2 == 1)
+
+        return output
+
+    def covers_points_array(self, points: Points) -> np.ndarray:
+        """Return a boolean array of whether the polygon covers each point.
+        
+        Points may be Points, a PointArray or an (N, 2) array of x, y. The
+        same test as covers_point, vectorised over points and edges.
+        """
+        coordinates = _as_coordinates(points)
+        output = np.zeros(len(coordinates), dtype=bool)
+
+        if not self.vertices or not self._crossing_coefficients:
+            return output
+
+        y_mins, y_maxes, x_starts, inverse_gradients = (
+            np.array(self._crossing_coefficients, dtype=float).T
+        )
+        min_x, min_y, max_x, max_y = self._bounds
+        batch_size = max(1, _MAX_BATCH_CELLS // len(y_mins))
+
+        for start in range(0, len(coordinates), batch_size):
+            xs = coordinates[start:start + batch_size, 0:1]
+            ys = coordinates[start:start + batch_size, 1:2]
+
+            # Count the crossings at or left of each point, for each edge
+            crossings = x_starts + ((ys - y_mins) * inverse_gradients)
+            n_crossings = np.count_nonzero(
+                (y_mins <= ys) & (ys < y_maxes) & (crossings <= xs), axis=1
+            )
+
+            in_bounds = (
+                (min_x <= xs) & (xs <= max_x) & (min_y <= ys) & (ys <= max_y)
+            )[:, 0]
+            output[start:start + batch_size] = in_bounds & (n_crossings % 2 == 1)
+
+        return output
+
+    def scanline_spans(
+        self, 
+        width: Optional[int]=None, 
+        height: Optional[int]=None
+    ) -> Iterator[Tuple[int, int, int]]:
+        """Yield (y, x_start, x_stop) spans of the whole cells covered.
+        
+        Cells are covered if covers_point would be true for them; x_stop is
+        excluded. Spans are clipped to the width and height, if given. Edges
+        are only considered on the rows they span (an active edge table), 
+        so the cost depends on the perimeter and number of rows, not area.
+        """
+        if not self.vertices:
+            return
+
+        # Edges are activated in order of their lowest row
+        pending = sorted(self._crossing_coefficients)
+        active = []
+        next_pending = 0
+
+        min_y, max_y = self._bounds[1], self._bounds[3]
+        first_row = math.ceil(min_y) if height is None else max(
+            0, math.ceil(min_y)
+        )
+        last_row = math.floor(max_y) if height is None else min(
+            height - 1, math.floor(max_y)
+        )
+
+        for y in range(first_row, last_row + 1):
+            while (
+                next_pending < len(pending) and pending[next_pending][0] <= y
+            ):
+                active.append(pending[next_pending])
+                next_pending += 1
+
+            active = [edge for edge in active if y < edge[1]]
+
+            crossings = sorted(
+                x_start + ((y - y_min) * inverse_gradient)
+                for y_min, _, x_start, inverse_gradient in active
+            )
+
+            # Cells between each pair of crossings are inside the polygon
+            for number in range(0, len(crossings) - 1, 2):
+                x_start = math.ceil(crossings[number])
+                x_stop = math.ceil(crossings[number + 1])
+
+                if width is not None:
+                    x_start = max(0, x_start)
+                    x_stop = min(width, x_stop)
+
+                if x_start < x_stop:
+                    yield y, x_start, x_stop
+
+    def rasterise_into(
+        self, 
+        buffer: bytearray, 
+        width: int, 
+        height: int, 
+        row_stride: Optional[int]=None
+    ) -> None:
+        """Set the bits of the cells covered in a packed 1-bit pixel buffer.
         
-        return True
+        Rows are row_stride bytes apart (by default, the fewest bytes to fit
+        the width); the first cell of a row is the highest bit of its first 
+        byte.
+        """
+        if row_stride is None:
+            row_stride = (width + 7) // 8
+
+        for y, x_start, x_stop in self.scanline_spans(width, height):
+            first_byte = (y * row_stride) + (x_start >> 3)
+            end_byte = (y * row_stride) + ((x_stop + 7) >> 3)
+            n_bits = (end_byte - first_byte) * 8
+
+            # Each span is set in a single operation over the bytes it touches
+            mask = ((1 << (x_stop - x_start)) - 1) << (
+                n_bits - (x_stop - (x_start & ~7))
+            )
+            current = int.from_bytes(
+                buffer[first_byte:end_byte], byteorder='big'
+            )
+            buffer[first_byte:end_byte] = (current | mask).to_bytes(
+                end_byte - first_byte, byteorder='big'
+            )
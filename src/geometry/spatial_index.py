@@ -0,0 +1,299 @@
+from __future__ import annotations
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+from abc import ABC, abstractmethod
+import math
+
+from geometry.point import Point
+
+# Bounds are stored as (min_x, min_y, max_x, max_y)
+Bounds = Tuple[float, float, float, float]
+
+
+def bounds_of(shape) -> Bounds:
+    """Return the bounds of a Point or anything with a bounding_box."""
+    if isinstance(shape, Point):
+        return shape.x, shape.y, shape.x, shape.y
+
+    minimum, maximum = shape.bounding_box
+    return minimum.x, minimum.y, maximum.x, maximum.y
+
+
+def _overlaps(bounds: Bounds, other: Bounds) -> bool:
+    """Check whether two bounds overlap (touching counts)."""
+    return (
+        bounds[0] <= other[2] and other[0] <= bounds[2] and
+        bounds[1] <= other[3] and other[1] <= bounds[3]
+    )
+
+
+def _contains(bounds: Bounds, other: Bounds) -> bool:
+    """Check whether bounds wholly contain other bounds."""
+    return (
+        bounds[0] <= other[0] and other[2] <= bounds[2] and
+        bounds[1] <= other[1] and other[3] <= bounds[3]
+    )
+
+
+class SpatialIndex(ABC):
+    """Index of items by the bounds of their shape (Point, Edge, Polygon).
+    
+    Items can be any hashable value; if no shape is given on insert, the 
+    item is taken to be its own shape.
+    """
+    def __init__(self):
+        self._bounds: Dict[Hashable, Bounds] = {}
+
+    def __len__(self) -> int:
+        return len(self._bounds)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._bounds
+
+    def insert(self, item: Hashable, shape=None) -> None:
+        """Add an item to the index."""
+        if item in self._bounds:
+            raise KeyError(f"{item!r} is already in the index.")
+
+        bounds = bounds_of(item if shape is None else shape)
+        self._bounds[item] = bounds
+        self._add(item, bounds)
+
+    def remove(self, item: Hashable) -> None:
+        """Remove an item from the index."""
+        self._discard(item, self._bounds.pop(item))
+
+    def move(self, item: Hashable, shape=None) -> None:
+        """Update the position of an item already in the index."""
+        old = self._bounds[item]
+        new = self._bounds[item] = bounds_of(item if shape is None else shape)
+        self._move(item, old, new)
+
+    def query_rect(self, minimum: Point, maximum: Point) -> Set[Hashable]:
+        """Return the items whose bounds overlap a rectangle."""
+        rect = (minimum.x, minimum.y, maximum.x, maximum.y)
+        return {
+            item for item in self._candidates(rect) 
+            if _overlaps(self._bounds[item], rect)
+        }
+
+    def query_radius(self, centre: Point, radius: float) -> Set[Hashable]:
+        """Return the items whose bounds come within a radius of a point."""
+        rect = (
+            centre.x - radius, centre.y - radius, 
+            centre.x + radius, centre.y + radius
+        )
+        radius_squared = radius ** 2
+        output = set()
+
+        for item in self._candidates(rect):
+            min_x, min_y, max_x, max_y = self._bounds[item]
+
+            # Distance from the centre to the nearest part of the bounds
+            x_delta = max(min_x - centre.x, 0, centre.x - max_x)
+            y_delta = max(min_y - centre.y, 0, centre.y - max_y)
+
+            if (x_delta ** 2) + (y_delta ** 2) <= radius_squared:
+                output.add(item)
+
+        return output
+
+    @abstractmethod
+    def _add(self, item: Hashable, bounds: Bounds) -> None:
+        """Add an item to the index structure."""
+
+    @abstractmethod
+    def _discard(self, item: Hashable, bounds: Bounds) -> None:
+        """Remove an item from the index structure."""
+
+    def _move(self, item: Hashable, old: Bounds, new: Bounds) -> None:
+        self._discard(item, old)
+        self._add(item, new)
+
+    @abstractmethod
+    def _candidates(self, rect: Bounds) -> Set[Hashable]:
+        """Return items which may overlap the rectangle (a superset)."""
+
+
+class UniformGrid(SpatialIndex):
+    """Spatial index bucketing items into square cells of a fixed size.
+    
+    A cell size close to the typical query radius (e.g. a SearchMap's 
+    search_radius) keeps queries to a handful of cells.
+    """
+    def __init__(self, cell_size: float):
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive.")
+
+        super().__init__()
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], Set[Hashable]] = {}
+
+    @classmethod
+    def for_search_map(cls, search_map) -> UniformGrid:
+        """Create a grid with cells sized to a SearchMap's search radius."""
+        return cls(cell_size=search_map.search_radius)
+
+    def _cell_range(self, bounds: Bounds) -> Tuple[int, int, int, int]:
+        """Return the (first x, first y, last x, last y) cells of bounds."""
+        return (
+            math.floor(bounds[0] / self.cell_size),
+            math.floor(bounds[1] / self.cell_size),
+            math.floor(bounds[2] / self.cell_size),
+            math.floor(bounds[3] / self.cell_size)
+        )
+
+    def _cells_of(self, bounds: Bounds) -> List[Tuple[int, int]]:
+        first_x, first_y, last_x, last_y = self._cell_range(bounds)
+        return [
+            (cell_x, cell_y) 
+            for cell_x in range(first_x, last_x + 1)
+            for cell_y in range(first_y, last_y + 1)
+        ]
+
+    def _add(self, item: Hashable, bounds: Bounds) -> None:
+        for cell in self._cells_of(bounds):
+            self._cells.setdefault(cell, set()).add(item)
+
+    def _discard(self, item: Hashable, bounds: Bounds) -> None:
+        for cell in self._cells_of(bounds):
+            items = self._cells[cell]
+            items.discard(item)
+
+            if not items:
+                del self._cells[cell]
+
+    def _move(self, item: Hashable, old: Bounds, new: Bounds) -> None:
+        # Most moves stay within the same cells; nothing to do then
+        if self._cell_range(old) != self._cell_range(new):
+            super()._move(item, old, new)
+
+    def _candidates(self, rect: Bounds) -> Set[Hashable]:
+        first_x, first_y, last_x, last_y = self._cell_range(rect)
+        candidates = set()
+
+        # A large rectangle over a sparse grid is cheaper to answer per cell
+        n_query_cells = (last_x - first_x + 1) * (last_y - first_y + 1)
+
+        if n_query_cells > len(self._cells):
+            for (cell_x, cell_y), items in self._cells.items():
+                if first_x <= cell_x <= last_x and first_y <= cell_y <= last_y:
+                    candidates |= items
+            return candidates
+
+        for cell_x in range(first_x, last_x + 1):
+            for cell_y in range(first_y, last_y + 1):
+                candidates |= self._cells.get((cell_x, cell_y), set())
+
+        return candidates
+
+
+class _QuadTreeNode:
+    def __init__(self, bounds: Bounds, depth: int):
+        self.bounds = bounds
+        self.depth = depth
+        self.items: Set[Hashable] = set()
+        self.children: Optional[List[_QuadTreeNode]] = None
+
+    def split(self) -> None:
+        min_x, min_y, max_x, max_y = self.bounds
+        mid_x = (min_x + max_x) / 2
+        mid_y = (min_y + max_y) / 2
+
+        self.children = [
+            _QuadTreeNode(child_bounds, self.depth + 1) 
+            for child_bounds in (
+                (min_x, min_y, mid_x, mid_y),
+                (mid_x, min_y, max_x, mid_y),
+                (min_x, mid_y, mid_x, max_y),
+                (mid_x, mid_y, max_x, max_y)
+            )
+        ]
+
+    def child_containing(self, bounds: Bounds) -> Optional[_QuadTreeNode]:
+        for child in self.children:
+            if _contains(child.bounds, bounds):
+                return child
+        return None
+
+
+class QuadTree(SpatialIndex):
+    """Spatial index recursively splitting an area into quarters.
+    
+    Each item is kept in the smallest node which wholly contains its bounds;
+    items outside the tree's area are kept at the root.
+    """
+    def __init__(
+        self, 
+        minimum: Point, 
+        maximum: Point, 
+        capacity: int=8, 
+        max_depth: int=8
+    ):
+        super().__init__()
+        self.capacity = capacity
+        self.max_depth = max_depth
+        self._root = _QuadTreeNode(
+            (minimum.x, minimum.y, maximum.x, maximum.y), depth=0
+        )
+        self._nodes: Dict[Hashable, _QuadTreeNode] = {}
+
+    def _add(self, item: Hashable, bounds: Bounds) -> None:
+        node = self._root
+
+        while node.children is not None:
+            child = node.child_containing(bounds)
+            if child is None:
+                break
+            node = child
+
+        node.items.add(item)
+        self._nodes[item] = node
+
+        if (
+            node.children is None and 
+            len(node.items) > self.capacity and 
+            node.depth < self.max_depth
+        ):
+            self._split(node)
+
+    def _split(self, node: _QuadTreeNode) -> None:
+        node.split()
+
+        for item in list(node.items):
+            child = node.child_containing(self._bounds[item])
+
+            if child is not None:
+                node.items.discard(item)
+                child.items.add(item)
+                self._nodes[item] = child
+
+    def _discard(self, item: Hashable, bounds: Bounds) -> None:
+        self._nodes.pop(item).items.discard(item)
+
+    def _move(self, item: Hashable, old: Bounds, new: Bounds) -> None:
+        # Items which still fit their node (and no child of it) stay put
+        node = self._nodes[item]
+        fits_node = node is self._root or _contains(node.bounds, new)
+
+        if fits_node and (
+            node.children is None or node.child_containing(new) is None
+        ):
+            return
+
+        super()._move(item, old, new)
+
+    def _candidates(self, rect: Bounds) -> Set[Hashable]:
+        candidates = set()
+        nodes = [self._root]
+
+        while nodes:
+            node = nodes.pop()
+            candidates |= node.items
+
+            if node.children is not None:
+                nodes.extend(
+                    child for child in node.children 
+                    if _overlaps(child.bounds, rect)
+                )
+
+        return candidates
@@ -1,24 +1,77 @@
 from __future__ import annotations
 from typing import List
 from functools import cached_property
+import mmap
+import os
+import struct
+
+try:
+    import numpy as np
+except ImportError:     # numpy is an optional dependency
+    np = None
 
 from map.bitmap.colour_table import ColourTableEntry
 
 class BitMap:
     """Type enabling the reading of basic (e.g. 1-bpp) bitmap images."""
-    def __init__(self, image_file_path: str):
+    def __init__(self, image_file_path: str, use_mmap: bool=False):
         self.image_file_path = image_file_path
+        self.use_mmap = use_mmap
+        self._mmap = None
 
+        # Either way the data is writable in memory, but changes are never 
+        # written back to the file
         with open(image_file_path, 'rb') as bmp:
-            self.raw = bmp.read()
+            if use_mmap:
+                # Pages of the file are only read from disk once touched, so 
+                # opening a map costs the same regardless of its size
+                self._mmap = mmap.mmap(bmp.fileno(), 0, access=mmap.ACCESS_COPY)
+                self.raw = self._mmap
+            else:
+                self.raw = bytearray(os.fstat(bmp.fileno()).st_size)
+                bmp.readinto(self.raw)
+
+        # Zero-copy view over the raw data; slices of it don't copy bytes
+        self.buffer = memoryview(self.raw)
 
         # DIB header start position is fixed at 14
         self.dib_header_start = 14
 
+    def __enter__(self) -> BitMap:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the underlying buffer (and the file mapping, if any).
+        
+        Row views returned by get_pixel_array must be released before the
+        file mapping can be closed; if any are still alive a BufferError is 
+        raised and the bitmap is left open.
+        """
+        self.buffer.release()
+
+        if self._mmap is None:
+            return
+
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Leave the bitmap usable rather than half closed
+            self.buffer = memoryview(self.raw)
+            raise
+
+        self._mmap = None
+
+    def _unpack_field(self, field_format: str, offset: int) -> int:
+        """Unpack a single little-endian header field at the given offset."""
+        return struct.unpack_from(field_format, self.buffer, offset)[0]
+
     @cached_property
     def bmp_header(self) -> bytes:
         """Return the bitmap header (exactly 14 bytes)."""
-        return self.raw[:self.dib_header_start]
+        return bytes(self.buffer[:self.dib_header_start])
 
     @cached_property
     def file_header(self) -> str:
@@ -29,13 +82,13 @@ class BitMap:
     @cached_property
     def file_size_in_bytes(self) -> int:
         """Return the total file size, in bytes."""
-        # Bytes 2-4 of the file / bmp header (same thing)
-        return int.from_bytes(self.bmp_header[2:4], byteorder='little')
+        # Bytes 2-6 of the file / bmp header (same thing)
+        return self._unpack_field('<I', 2)
 
     @cached_property
     def dib_header_size_bytes(self) -> int:
         """Return the DIB header size (specified in bytes 14-18 of the file)."""
-        return int.from_bytes(self.raw[14:18], byteorder='little')
+        return self._unpack_field('<I', self.dib_header_start)
 
     @cached_property
     def dib_header_end(self) -> int:
@@ -46,28 +99,34 @@ class BitMap:
     def dib_header(self) -> bytes:
         """Return the DIB header (starting at byte 14; variable length)."""
         # DIB header starts at byte 14; length is in dib_header_size_bytes."""
-        return self.raw[self.dib_header_start:self.dib_header_end]
+        return bytes(self.buffer[self.dib_header_start:self.dib_header_end])
 
     @cached_property
     def image_data_offset(self) -> int:
         """Return the starting starting address (offset) of image data."""
         # Last four bytes of the BMP header
-        return int.from_bytes(self.bmp_header[-4:], byteorder='little')
+        return self._unpack_field('<I', 10)
 
     @cached_property
     def image_height_px(self) -> int:
         """Return the height of the image in pixels."""
-        return int.from_bytes(self.dib_header[8:12], byteorder='little')
+        # A negative height denotes a 'top down' image (see is_top_down)
+        return abs(self._unpack_field('<i', self.dib_header_start + 8))
+
+    @cached_property
+    def is_top_down(self) -> bool:
+        """Indicate whether the pixel rows are stored top row first."""
+        return self._unpack_field('<i', self.dib_header_start + 8) < 0
 
     @cached_property
     def image_width_px(self) -> int:
         """Return the width of the image in pixels."""
-        return int.from_bytes(self.dib_header[4:8], byteorder='little')
+        return self._unpack_field('<I', self.dib_header_start + 4)
 
     @cached_property
     def bits_per_pixel(self) -> int:
         """Return the number of bits used to per pixel in the pixel array."""
-        return int.from_bytes(self.dib_header[14:16], byteorder='little')
+        return self._unpack_field('<H', self.dib_header_start + 14)
 
     @cached_property
     def image_data_bits_per_row(self) -> int:
@@ -77,7 +136,8 @@ class BitMap:
     @cached_property
     def image_data_row_width_bytes(self) -> int:
         """Return the length of the rows containing pixel data."""
-        return int(((self.image_data_bits_per_row + 31) / 32) * 4)
+        # Rows are padded to a multiple of four bytes
+        return ((self.image_data_bits_per_row + 31) // 32) * 4
 
     @cached_property
     def image_data_end(self) -> int:
@@ -100,7 +160,7 @@ class BitMap:
     def n_colours_in_palette(self) -> int:
         """Return the number of colours in the palette from DIB header."""
         # Found in bytes 32-36 of the dib header (not of the file!)
-        return int.from_bytes(self.dib_header[32:36], byteorder='little')
+        return self._unpack_field('<I', self.dib_header_start + 32)
 
     @cached_property
     def colour_table(self) -> List[ColourTableEntry]:
@@ -108,39 +168,102 @@ class BitMap:
 
         # Colour table bytes are between the end of the DIB header and the start 
         # of the pixel data
-        colour_table_bytes = self.raw[
-            self.dib_header_end:self.image_data_offset
-        ]
+        colour_table_bytes = bytes(
+            self.buffer[self.dib_header_end:self.image_data_offset]
+        )
 
         # The number of entries in the table should be specified in the DIB 
-        # header (e.g. n_colours_in_palette); each colour in the table will 
-        # have a four bytes entry (b,g,r,padding)
+        # header (e.g. n_colours_in_palette); 0 means the full palette for 
+        # the bit depth. Each colour in the table will have a four bytes 
+        # entry (b,g,r,padding)
+        n_colours = self.n_colours_in_palette
+        if not n_colours and self.bits_per_pixel <= 8:
+            n_colours = 1 << self.bits_per_pixel
+
         return [
             ColourTableEntry(
                 colour_table_bytes[colour*4:(colour+1)*4]
-            ) for colour in range(self.n_colours_in_palette)
+            ) for colour in range(n_colours)
         ]
 
-    def get_pixel_array(self) -> List[bytearray]:
-        """Return a list of byte arrays representing pixel rows in the image."""
-        # TODO: I'm not sure if this is implemented nicely; or whether there's
-        # some alternative way to e.g. get a series of bits instead
-        pixel_array = []
-
-        # BMP image data is most often stored 'upside down', so we loop the data
-        # in reverse - row by row
-        for pixel in reversed(range(self.image_height_px)):
-            start = (
-                self.image_data_offset + (
-                    self.image_data_row_width_bytes * pixel
-                )
-            )
+    @cached_property
+    def row_offsets(self) -> List[int]:
+        """Return the offset of the start of each pixel row; row 0 is the top."""
+        rows = range(self.image_height_px)
+
+        # BMP image data is most often stored 'upside down', so the top row of
+        # the image is the last row in the data
+        if not self.is_top_down:
+            rows = reversed(rows)
 
-            pixel_array.append(
-                self.raw[
-                    start:
-                    start+self.image_data_row_width_bytes
-                ]
+        return [
+            self.image_data_offset + (self.image_data_row_width_bytes * row)
+            for row in rows
+        ]
+
+    def get_pixel_row(self, row: int) -> memoryview:
+        """Return a zero-copy view of a single (padded) pixel row."""
+        start = self.row_offsets[row]
+        return self.buffer[start:start+self.image_data_row_width_bytes]
+
+    def get_pixel_array(self) -> List[memoryview]:
+        """Return a list of zero-copy views representing pixel rows."""
+        return [
+            self.get_pixel_row(row) for row in range(self.image_height_px)
+        ]
+
+    def to_ndarray(self, rgb: bool=False) -> np.ndarray:
+        """Decode the pixel data into a numpy array (row 0 is the top).
+        
+        Paletted (1, 2, 4 and 8-bpp) images give an (H, W) array of colour 
+        table indices, or an (H, W, 3) array of RGB values if rgb is set. 
+        24 and 32-bpp images always give an (H, W, 3) array of RGB values.
+        """
+        if np is None:
+            raise ImportError("numpy is required for BitMap.to_ndarray")
+
+        height = self.image_height_px
+        width = self.image_width_px
+        bits_per_pixel = self.bits_per_pixel
+
+        rows = np.frombuffer(
+            self.buffer, 
+            dtype=np.uint8, 
+            count=self.image_data_row_width_bytes * height,
+            offset=self.image_data_offset
+        ).reshape(height, self.image_data_row_width_bytes)
+
+        if not self.is_top_down:
+            rows = rows[::-1]
+
+        if bits_per_pixel in (1, 2, 4):
+            # Split each row into single bits, drop the end-of-row padding and 
+            # weight each group of bits to get one colour table index per pixel
+            bits = np.unpackbits(rows, axis=1)[:, :width * bits_per_pixel]
+            weights = 1 << np.arange(bits_per_pixel - 1, -1, -1, dtype=np.uint8)
+            pixels = (
+                bits.reshape(height, width, bits_per_pixel) * weights
+            ).sum(axis=2, dtype=np.uint8)
+
+        elif bits_per_pixel == 8:
+            pixels = rows[:, :width].copy()
+
+        elif bits_per_pixel in (24, 32):
+            # Pixels are stored as b, g, r(, padding)
+            bytes_per_pixel = bits_per_pixel // 8
+            return rows[:, :width * bytes_per_pixel].reshape(
+                height, width, bytes_per_pixel
+            )[:, :, 2::-1].copy()
+
+        else:
+            raise ValueError(
+                f"Unsupported bits per pixel for decoding: {bits_per_pixel}"
             )
 
-        return pixel_array
\ No newline at end of file
+        if not rgb:
+            return pixels
+
+        palette = np.array(
+            [entry.rgb for entry in self.colour_table], dtype=np.uint8
+        )
+        return palette[pixels]
@@ -0,0 +1,215 @@
+from __future__ import annotations
+from typing import List, Optional
+from array import array
+import math
+import os
+import struct
+import sys
+
+from map.bitmap.monochrome_bitmap import MonochromeBitMap
+
+# A cached map is a fixed-size header followed by the distances (little-endian
+# doubles, row 0 first); the source file's size and modification time tell if 
+# the cache is stale
+MAGIC = b"GLCM"
+VERSION = 1
+CACHE_SUFFIX = ".clearance"
+
+# magic, version, (3 padding bytes), width, height, source size, source mtime
+HEADER_FORMAT = "<4sBxxxIIQq"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+# Stands in for infinity in the transform (which would give inf - inf = nan)
+_FAR = 1e20
+
+
+def squared_distances_1d(values: List[float]) -> List[float]:
+    """Return the 1D squared distance transform of sampled values.
+    
+    Each output is min over q of (p - q)^2 + values[q], found from the lower
+    envelope of the parabolas rooted at each q (Felzenszwalb & Huttenlocher).
+    """
+    n = len(values)
+    output = [0.0] * n
+
+    # Roots of the parabolas in the envelope, and the boundaries between them
+    roots = [0] * n
+    boundaries = [0.0] * (n + 1)
+    boundaries[0] = -math.inf
+    boundaries[1] = math.inf
+    k = 0
+
+    def crossing(q: int, root: int) -> float:
+        """Return where the parabolas rooted at q and root cross."""
+        return (
+            (values[q] + (q * q)) - (values[root] + (root * root))
+        ) / (2 * (q - root))
+
+    for q in range(1, n):
+        position = crossing(q, roots[k])
+
+        # Drop the parabolas the new one hides (the first's boundary is -inf)
+        while position <= boundaries[k]:
+            k -= 1
+            position = crossing(q, roots[k])
+
+        k += 1
+        roots[k] = q
+        boundaries[k] = position
+        boundaries[k + 1] = math.inf
+
+    k = 0
+
+    for p in range(n):
+        while boundaries[k + 1] < p:
+            k += 1
+
+        root = roots[k]
+        output[p] = ((p - root) ** 2) + values[root]
+
+    return output
+
+
+class ClearanceMap:
+    """Exact Euclidean distance from each pixel to the nearest obstacle.
+    
+    Distances are between pixel centres, so obstacles have a clearance of 0;
+    maps without obstacles are clear (math.inf) everywhere. A clearance 
+    query is a single array read.
+    """
+    def __init__(self, width: int, height: int, distances: array):
+        self.width = width
+        self.height = height
+        self.distances = distances
+
+    @classmethod
+    def from_bitmap(cls, bitmap: MonochromeBitMap) -> ClearanceMap:
+        """Compute the distance transform of a bitmap's obstacles.
+        
+        Two separable passes: down each column, then along each row.
+        """
+        width = bitmap.image_width_px
+        height = bitmap.image_height_px
+        obstacle_bit = bitmap.obstacle_bit
+        row_bits = bitmap.image_data_row_width_bytes * 8
+
+        columns = [[_FAR] * height for _ in range(width)]
+
+        for y in range(height):
+            row = int.from_bytes(bitmap.get_pixel_row(y), byteorder='big')
+
+            for x in range(width):
+                if (row >> (row_bits - 1 - x)) & 1 == obstacle_bit:
+                    columns[x][y] = 0.0
+
+        columns = [squared_distances_1d(column) for column in columns]
+        distances = array('d')
+
+        for y in range(height):
+            for squared in squared_distances_1d(
+                [column[y] for column in columns]
+            ):
+                distances.append(
+                    math.sqrt(squared) if squared < _FAR else math.inf
+                )
+
+        return cls(width, height, distances)
+
+    @classmethod
+    def for_bitmap(
+        cls, 
+        bitmap: MonochromeBitMap, 
+        use_cache: bool=True
+    ) -> ClearanceMap:
+        """Return the bitmap's clearance map, cached next to its file.
+        
+        The cache is reused while the file's size and modification time are 
+        unchanged. Edits made in memory (e.g. set_pixel_bit) aren't noticed.
+        """
+        if not use_cache:
+            return cls.from_bitmap(bitmap)
+
+        cache_path = bitmap.image_file_path + CACHE_SUFFIX
+        source = os.stat(bitmap.image_file_path)
+
+        try:
+            with open(cache_path, 'rb') as cache:
+                clearance_map = cls.from_bytes(
+                    cache.read(), source.st_size, source.st_mtime_ns
+                )
+        except OSError:
+            clearance_map = None
+
+        if clearance_map is not None:
+            return clearance_map
+
+        clearance_map = cls.from_bitmap(bitmap)
+
+        # A read-only directory just means no cache
+        try:
+            with open(cache_path, 'wb') as cache:
+                cache.write(
+                    clearance_map.to_bytes(source.st_size, source.st_mtime_ns)
+                )
+        except OSError:
+            pass
+
+        return clearance_map
+
+    def to_bytes(self, source_size: int, source_mtime_ns: int) -> bytes:
+        """Serialise the map, recording the size and mtime of its source."""
+        header = struct.pack(
+            HEADER_FORMAT, 
+            MAGIC, 
+            VERSION, 
+            self.width, 
+            self.height, 
+            source_size, 
+            source_mtime_ns
+        )
+
+        distances = self.distances
+        if sys.byteorder == 'big':
+            distances = array('d', distances)
+            distances.byteswap()
+
+        return header + distances.tobytes()
+
+    @classmethod
+    def from_bytes(
+        cls, 
+        data: bytes, 
+        source_size: int, 
+        source_mtime_ns: int
+    ) -> Optional[ClearanceMap]:
+        """Return a serialised map, or None if it is invalid or stale."""
+        if len(data) < HEADER_SIZE:
+            return None
+
+        magic, version, width, height, size, mtime_ns = struct.unpack_from(
+            HEADER_FORMAT, data
+        )
+
+        if (
+            magic != MAGIC or 
+            version != VERSION or
+            (size, mtime_ns) != (source_size, source_mtime_ns) or
+            len(data) != HEADER_SIZE + (width * height * 8)
+        ):
+            return None
+
+        distances = array('d')
+        distances.frombytes(data[HEADER_SIZE:])
+
+        if sys.byteorder == 'big':
+            distances.byteswap()
+
+        return cls(width, height, distances)
+
+    def clearance(self, x: int, y: int) -> float:
+        """Return the distance from a pixel to the nearest obstacle."""
+        return self.distances[(y * self.width) + x]
+
+    def has_clearance(self, x: int, y: int, radius: float) -> bool:
+        """Check whether a unit of the given radius fits at a pixel."""
+        return self.distances[(y * self.width) + x] > radius
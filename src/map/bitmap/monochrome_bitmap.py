@@ -1,30 +1,128 @@
+from typing import Iterable, List, Sequence
+from functools import cached_property
+
+from geometry.point import Point
+from geometry.edge import Edge
 from map.bitmap.bitmap import BitMap
 from map.bitmap.colour_table import ColourTableEntry
 
 class MonochromeBitMap(BitMap):
+
+    @cached_property
+    def obstacle_bit(self) -> int:
+        """Return the bit value of obstacle (black) pixels."""
+        # Usually black is the first colour in the table, but not always
+        if len(self.colour_table) > 1 and self.colour_table[1].is_black:
+            return 1
+        return 0
+
+    def _check_bounds(self, x: int, y: int) -> None:
+        """Raise an IndexError if a pixel is outside the image."""
+        if not (0 <= x < self.image_width_px and 0 <= y < self.image_height_px):
+            raise IndexError(f"Pixel ({x}, {y}) is outside the image.")
+
+    def is_blocked(self, x: int, y: int) -> bool:
+        """Check whether a pixel is an obstacle."""
+        return self.query_pixel_bit(x, y) == self.obstacle_bit
+
+    def query_pixel_bit(self, x: int, y: int) -> int:
+        """Return the bit value (0 or 1) for a specified pixel."""
+        self._check_bounds(x, y)
+
+        # Find the byte containing our pixel ([y, x]) directly in the buffer;
+        # the row offsets are only calculated once
+        byte = self.buffer[self.row_offsets[y] + (x >> 3)]
+
+        # Create a bitmask based on the target bit position
+        query_bitmask = 128 >> (x & 7)
+
+        return 1 if byte & query_bitmask else 0
     
+    def set_pixel_bit(self, x: int, y: int, bit: int) -> None:
+        """Set the bit value (0 or 1) of a pixel in memory (not the file)."""
+        self._check_bounds(x, y)
+        index = self.row_offsets[y] + (x >> 3)
+        bitmask = 128 >> (x & 7)
+
+        if bit:
+            self.buffer[index] |= bitmask
+        else:
+            self.buffer[index] &= ~bitmask & 0xFF
+
     def query_pixel_colour(self, x: int, y: int) -> ColourTableEntry:
         """Return a colour table entry for a specified pixel."""
-        
-        # Identify where our pixel will be in the image data
-        target_byte_index = x // 8
-        target_bit_position =  x % 8
+        return self.colour_table[self.query_pixel_bit(x, y)]
 
-        # Create a bitmask based on the target bit position
-        query_bitmask = 128 >> target_bit_position
+    def query_pixels(
+        self, 
+        xs: Sequence[int], 
+        ys: Sequence[int]
+    ) -> List[ColourTableEntry]:
+        """Return colour table entries for many pixels at once."""
+        if len(xs) != len(ys):
+            raise ValueError("xs and ys must be of equal length.")
 
-        # Fetch the byte containing our pixel ([y, x])
-        byte = self.get_pixel_array()[y][target_byte_index]
+        # Checking the extremes covers every pixel
+        if xs:
+            self._check_bounds(min(xs), min(ys))
+            self._check_bounds(max(xs), max(ys))
 
-        # Moves the single set bit to the 'first' position
-        # bit = (byte & query_bitmask) >> (7 - target_bit_position)
-        
-        # Achieves the same as above, though possibly more simply
-        bit = 1 if byte & query_bitmask else 0
+        # Local names avoid repeated attribute lookups in the loop
+        buffer = self.buffer
+        row_offsets = self.row_offsets
+        colour_table = self.colour_table
 
-        # The colour table entry for the bit value
-        return self.colour_table[bit]
+        return [
+            colour_table[
+                1 if buffer[row_offsets[y] + (x >> 3)] & (128 >> (x & 7)) else 0
+            ]
+            for x, y in zip(xs, ys)
+        ]
 
+    def has_line_of_sight(self, origin: Point, target: Point) -> bool:
+        """Check that no obstacle lies on the line between two points.
         
+        Only the pixels strictly between the two points are checked; the 
+        walk along the line stops at the first obstacle. Both points must be
+        on the image (and so is every pixel between them).
+        """
+        buffer = self.buffer
+        row_offsets = self.row_offsets
+        obstacle_bit = self.obstacle_bit
+        target_x, target_y = round(target.x), round(target.y)
+
+        self._check_bounds(round(origin.x), round(origin.y))
+        self._check_bounds(target_x, target_y)
+
+        cells = Edge(origin, target).traverse()
+        next(cells)
+
+        for x, y in cells:
+            if x == target_x and y == target_y:
+                break
+
+            bit = 1 if buffer[row_offsets[y] + (x >> 3)] & (128 >> (x & 7)) else 0
+            if bit == obstacle_bit:
+                return False
+
+        return True
+
+    def visible_targets(
+        self, 
+        origin: Point, 
+        targets: Iterable[Point]
+    ) -> List[bool]:
+        """Check line of sight from one observer to each of many targets."""
+        # Targets sharing a position only need to be checked once
+        results = {}
+        output = []
+
+        for target in targets:
+            key = (target.x, target.y)
+
+            if key not in results:
+                results[key] = self.has_line_of_sight(origin, target)
 
+            output.append(results[key])
 
+        return output
@@ -0,0 +1,156 @@
+from typing import Dict, List, Optional, Tuple
+from array import array
+import re
+
+from geometry.point import Point
+from map.bitmap.monochrome_bitmap import MonochromeBitMap
+
+NO_REGION = 0
+
+_WALKABLE_RUN = re.compile("1+")
+
+
+class Region:
+    """A connected area of walkable pixels."""
+    def __init__(self, label: int, area: int, minimum: Point, maximum: Point):
+        self.label = label
+        self.area = area
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def __repr__(self) -> str:
+        return (
+            f"Region(label={self.label}, area={self.area}, "
+            f"minimum={self.minimum}, maximum={self.maximum})"
+        )
+
+    @property
+    def bounding_box(self) -> Tuple[Point, Point]:
+        """Return the (minimum, maximum) corners (inclusive) of the region."""
+        return self.minimum, self.maximum
+
+
+class RegionIndex:
+    """Connected regions of the walkable pixels of a bitmap.
+    
+    Regions are 4-connected, matching the Pathfinder (which can't move 
+    diagonally between pixels that only touch at a corner), so two pixels 
+    share a region exactly when there is a path between them. Labelling 
+    works on runs of walkable pixels read from the packed rows, joined with
+    union-find; afterwards every query is a single array read.
+    """
+    def __init__(self, bitmap: MonochromeBitMap):
+        self.width = bitmap.image_width_px
+        self.height = bitmap.image_height_px
+
+        # Region label per pixel (NO_REGION for obstacles), and the regions
+        # in order of their top-left-most pixel
+        self.labels = array('I', [NO_REGION]) * (self.width * self.height)
+        self.regions: List[Region] = []
+
+        self._label(bitmap)
+
+    def _row_runs(self, bitmap: MonochromeBitMap, y: int) -> List[Tuple[int, int]]:
+        """Return the (start, stop) of each run of walkable pixels in a row."""
+        row = int.from_bytes(bitmap.get_pixel_row(y), byteorder='big')
+        bits = row >> ((bitmap.image_data_row_width_bytes * 8) - self.width)
+
+        if bitmap.obstacle_bit:
+            bits ^= (1 << self.width) - 1
+
+        return [
+            match.span() 
+            for match in _WALKABLE_RUN.finditer(format(bits, f"0{self.width}b"))
+        ]
+
+    def _label(self, bitmap: MonochromeBitMap) -> None:
+        """Find the runs of each row, and join runs overlapping between rows."""
+        runs: List[Tuple[int, int, int]] = []
+        parents = array('i')
+
+        def find(run: int) -> int:
+            while parents[run] != run:
+                parents[run] = parents[parents[run]]
+                run = parents[run]
+            return run
+
+        previous_row: List[Tuple[int, int, int]] = []
+
+        for y in range(self.height):
+            current_row = []
+            first = 0
+
+            for start, stop in self._row_runs(bitmap, y):
+                run = len(runs)
+                runs.append((y, start, stop))
+                parents.append(run)
+
+                # Runs above that end before this one starts can't touch any 
+                # later run in this row either
+                while first < len(previous_row) and previous_row[first][1] <= start:
+                    first += 1
+
+                above = first
+                while above < len(previous_row) and previous_row[above][0] < stop:
+                    root, other_root = find(run), find(previous_row[above][2])
+                    parents[max(root, other_root)] = min(root, other_root)
+                    above += 1
+
+                current_row.append((start, stop, run))
+
+            previous_row = current_row
+
+        # Give each set of runs a label and gather its area and bounds
+        labels_of_roots: Dict[int, int] = {}
+        bounds: List[List[int]] = []
+
+        for run, (y, start, stop) in enumerate(runs):
+            root = find(run)
+
+            if root not in labels_of_roots:
+                labels_of_roots[root] = len(bounds) + 1
+                bounds.append([0, start, y, stop - 1, y])
+
+            label = labels_of_roots[root]
+            region_bounds = bounds[label - 1]
+            region_bounds[0] += stop - start
+            region_bounds[1] = min(region_bounds[1], start)
+            region_bounds[3] = max(region_bounds[3], stop - 1)
+            region_bounds[4] = y
+
+            index = y * self.width
+            self.labels[index + start:index + stop] = (
+                array('I', [label]) * (stop - start)
+            )
+
+        self.regions = [
+            Region(label, area, Point(min_x, min_y), Point(max_x, max_y))
+            for label, (area, min_x, min_y, max_x, max_y) 
+            in enumerate(bounds, start=1)
+        ]
+
+    def label_at(self, x: int, y: int) -> int:
+        """Return the region label of a pixel (NO_REGION for obstacles)."""
+        return self.labels[(y * self.width) + x]
+
+    def region_at(self, point: Point) -> Optional[Region]:
+        """Return the region containing a point, if it isn't an obstacle."""
+        label = self.labels[(point.y * self.width) + point.x]
+        return self.regions[label - 1] if label != NO_REGION else None
+
+    def same_region(self, point_a: Point, point_b: Point) -> bool:
+        """Check whether there is a path between two (walkable) points."""
+        label = self.labels[(point_a.y * self.width) + point_a.x]
+        return (
+            label != NO_REGION and 
+            label == self.labels[(point_b.y * self.width) + point_b.x]
+        )
+
+    def enclosed_regions(self) -> List[Region]:
+        """Return the regions that don't touch the edge of the map (rooms)."""
+        return [
+            region for region in self.regions
+            if region.minimum.x > 0 and region.minimum.y > 0 and
+            region.maximum.x < self.width - 1 and 
+            region.maximum.y < self.height - 1
+        ]
@@ -0,0 +1,223 @@
+from typing import Iterable, List, Optional, Tuple
+from array import array
+import heapq
+
+from geometry.point import Point
+from map.bitmap.monochrome_bitmap import MonochromeBitMap
+from map.pathfinding.pathfinder import DIRECTIONS
+
+# Integer move costs (diagonals approximate 10 * sqrt(2))
+STRAIGHT_COST = 10
+DIAGONAL_COST = 14
+
+UNREACHABLE = 0xFFFFFFFF
+NO_DIRECTION = -1
+
+
+class FlowField:
+    """Cost to the goal and the next move from every cell of a bitmap.
+    
+    Costs and directions come from a single Dijkstra search out from the 
+    goal, so any number of units heading there can look up their next step 
+    without a path query of their own. Moves follow the same rules as the
+    Pathfinder (8-directional, no cutting the corners of obstacles).
+    """
+    def __init__(self, bitmap: MonochromeBitMap, goal: Point):
+        self.bitmap = bitmap
+        self.goal = goal
+        self.width = bitmap.image_width_px
+        self.height = bitmap.image_height_px
+
+        n_cells = self.width * self.height
+
+        # Per cell: walkability, cost to the goal (UNREACHABLE if there's no
+        # path) and the index into DIRECTIONS of the next move
+        self._walkable = bytearray(n_cells)
+        self.costs = array('I', [UNREACHABLE]) * n_cells
+        self.directions = array('b', [NO_DIRECTION]) * n_cells
+
+        # (dx, dy, index offset, cost, index of the opposite direction)
+        self._moves = [
+            (
+                dx, 
+                dy, 
+                (dy * self.width) + dx, 
+                DIAGONAL_COST if dx and dy else STRAIGHT_COST,
+                DIRECTIONS.index((-dx, -dy))
+            )
+            for dx, dy in DIRECTIONS
+        ]
+
+        self._load_walkable(0, 0, self.width - 1, self.height - 1)
+        self._propagate(self._seed_goal())
+
+    def _load_walkable(self, min_x: int, min_y: int, max_x: int, max_y: int) -> None:
+        """Read the walkability of an area (inclusive corners) from the bitmap."""
+        obstacle_bit = self.bitmap.obstacle_bit
+        row_bits = self.bitmap.image_data_row_width_bytes * 8
+
+        for y in range(min_y, max_y + 1):
+            row = int.from_bytes(self.bitmap.get_pixel_row(y), byteorder='big')
+            index = y * self.width
+
+            for x in range(min_x, max_x + 1):
+                bit = (row >> (row_bits - 1 - x)) & 1
+                self._walkable[index + x] = bit != obstacle_bit
+
+    def _seed_goal(self) -> List[int]:
+        """Set the goal's cost, returning it as the search's starting cell."""
+        index = (self.goal.y * self.width) + self.goal.x
+
+        if not (
+            0 <= self.goal.x < self.width and 
+            0 <= self.goal.y < self.height and
+            self._walkable[index]
+        ):
+            return []
+
+        self.costs[index] = 0
+        self.directions[index] = NO_DIRECTION
+        return [index]
+
+    def _propagate(self, seeds: Iterable[int]) -> None:
+        """Lower costs outwards from cells whose costs are already set."""
+        width, height = self.width, self.height
+        walkable, costs, directions = self._walkable, self.costs, self.directions
+
+        # Heap entries pack (cost, index) into one int
+        open_heap = [(costs[index] << 32) | index for index in seeds]
+        heapq.heapify(open_heap)
+
+        while open_heap:
+            entry = heapq.heappop(open_heap)
+            cost = entry >> 32
+            index = entry & 0xFFFFFFFF
+
+            # Skip entries superseded by a cheaper one
+            if cost != costs[index]:
+                continue
+
+            y, x = divmod(index, width)
+
+            for dx, dy, offset, move_cost, opposite in self._moves:
+                if not (0 <= x + dx < width and 0 <= y + dy < height):
+                    continue
+
+                next_index = index + offset
+
+                if not walkable[next_index]:
+                    continue
+
+                # Diagonal moves can't cut the corner of an obstacle
+                if dx and dy and not (
+                    walkable[index + dx] and walkable[index + (dy * width)]
+                ):
+                    continue
+
+                next_cost = cost + move_cost
+
+                if next_cost < costs[next_index]:
+                    costs[next_index] = next_cost
+                    directions[next_index] = opposite
+                    heapq.heappush(open_heap, (next_cost << 32) | next_index)
+
+    def update_region(self, minimum: Point, maximum: Point) -> None:
+        """Update the field after pixels in a region have changed.
+        
+        Only cells whose route to the goal passed through (or around the 
+        corners of) the region are searched again.
+        """
+        min_x, min_y = max(0, minimum.x), max(0, minimum.y)
+        max_x = min(self.width - 1, maximum.x)
+        max_y = min(self.height - 1, maximum.y)
+
+        if min_x > max_x or min_y > max_y:
+            return
+
+        self._load_walkable(min_x, min_y, max_x, max_y)
+
+        width, height = self.width, self.height
+        costs, directions = self.costs, self.directions
+
+        # Forget the region and its border, then every cell routed through them
+        stack = [
+            (y * width) + x
+            for y in range(max(0, min_y - 1), min(height, max_y + 2))
+            for x in range(max(0, min_x - 1), min(width, max_x + 2))
+        ]
+        invalidated = []
+
+        for index in stack:
+            costs[index] = UNREACHABLE
+            directions[index] = NO_DIRECTION
+
+        while stack:
+            index = stack.pop()
+            invalidated.append(index)
+            y, x = divmod(index, width)
+
+            for dx, dy, offset, _, opposite in self._moves:
+                if not (0 <= x + dx < width and 0 <= y + dy < height):
+                    continue
+
+                next_index = index + offset
+
+                # The neighbour's next move was into this cell
+                if (
+                    costs[next_index] != UNREACHABLE and 
+                    directions[next_index] == opposite
+                ):
+                    costs[next_index] = UNREACHABLE
+                    directions[next_index] = NO_DIRECTION
+                    stack.append(next_index)
+
+        # Search again from the cells bordering the forgotten ones
+        seeds = set(self._seed_goal())
+
+        for index in invalidated:
+            y, x = divmod(index, width)
+
+            for dx, dy, offset, _, _ in self._moves:
+                if (
+                    0 <= x + dx < width and 
+                    0 <= y + dy < height and 
+                    costs[index + offset] != UNREACHABLE
+                ):
+                    seeds.add(index + offset)
+
+        self._propagate(seeds)
+
+    def cost_at(self, x: int, y: int) -> Optional[int]:
+        """Return the cost from a cell to the goal, or None if unreachable."""
+        cost = self.costs[(y * self.width) + x]
+        return None if cost == UNREACHABLE else cost
+
+    def direction_at(self, x: int, y: int) -> Optional[Tuple[int, int]]:
+        """Return the (dx, dy) of a cell's next move, if it has one."""
+        direction = self.directions[(y * self.width) + x]
+        return None if direction == NO_DIRECTION else DIRECTIONS[direction]
+
+    def next_step(self, point: Point) -> Optional[Point]:
+        """Return the next cell towards the goal.
+        
+        None is returned at the goal, and wherever the goal can't be reached.
+        """
+        direction = self.directions[(point.y * self.width) + point.x]
+
+        if direction == NO_DIRECTION:
+            return None
+
+        dx, dy = DIRECTIONS[direction]
+        return Point(point.x + dx, point.y + dy)
+
+    def path_from(self, start: Point) -> Optional[List[Point]]:
+        """Return the cells from start to the goal (inclusive), or None."""
+        if self.cost_at(start.x, start.y) is None:
+            return None
+
+        path = [start]
+
+        while path[-1] != self.goal:
+            path.append(self.next_step(path[-1]))
+
+        return path
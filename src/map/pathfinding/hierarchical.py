@@ -0,0 +1,283 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import heapq
+import math
+
+from geometry.point import Point
+from map.bitmap.monochrome_bitmap import MonochromeBitMap
+from map.pathfinding.pathfinder import Pathfinder, octile_distance
+
+Cell = Tuple[int, int]
+Cluster = Tuple[int, int]
+Border = Tuple[Cluster, Cluster]
+
+# Entrances at least this wide get a transition at each end, not the middle
+LONG_ENTRANCE_WIDTH = 6
+
+
+class HierarchicalPathfinder:
+    """Hierarchical pathfinding (HPA*) over the walkable pixels of a bitmap.
+    
+    The bitmap is split into square clusters. Walkable runs along the border
+    between two clusters are entrances, each with one or two transitions (a
+    pair of cells either side of the border). Costs between the transitions
+    inside each cluster are worked out up front and cached as an abstract 
+    graph; long routes are searched on this small graph and only refined 
+    into cells one cluster at a time.
+    """
+    def __init__(self, bitmap: MonochromeBitMap, cluster_size: int=32):
+        # Searches never leave a cluster, so their arrays only need to cover one
+        self.pathfinder = Pathfinder(
+            bitmap, search_size=(cluster_size, cluster_size)
+        )
+        self.cluster_size = cluster_size
+        self.width = self.pathfinder.width
+        self.height = self.pathfinder.height
+        self.n_clusters_x = math.ceil(self.width / cluster_size)
+        self.n_clusters_y = math.ceil(self.height / cluster_size)
+
+        # Transitions per border, the transitions linked to each cell, and 
+        # the costs between the transitions within each cluster
+        self._border_links: Dict[Border, List[Tuple[Cell, Cell]]] = {}
+        self._partners: Dict[Cell, Set[Cell]] = {}
+        self._intra_edges: Dict[Cluster, Dict[Cell, Dict[Cell, float]]] = {}
+
+        self._rebuild(
+            (cluster_x, cluster_y)
+            for cluster_x in range(self.n_clusters_x)
+            for cluster_y in range(self.n_clusters_y)
+        )
+
+    def cluster_of(self, x: int, y: int) -> Cluster:
+        """Return the (cluster x, cluster y) containing a cell."""
+        return x // self.cluster_size, y // self.cluster_size
+
+    def _cluster_area(self, cluster: Cluster) -> Tuple[Point, Point]:
+        """Return the (minimum, maximum) cells of a cluster."""
+        min_x = cluster[0] * self.cluster_size
+        min_y = cluster[1] * self.cluster_size
+        return (
+            Point(min_x, min_y),
+            Point(
+                min(self.width, min_x + self.cluster_size) - 1, 
+                min(self.height, min_y + self.cluster_size) - 1
+            )
+        )
+
+    def _borders_of(self, cluster: Cluster) -> List[Border]:
+        """Return the borders a cluster shares with its neighbours."""
+        cluster_x, cluster_y = cluster
+        borders = []
+
+        if cluster_x > 0:
+            borders.append(((cluster_x - 1, cluster_y), cluster))
+        if cluster_x < self.n_clusters_x - 1:
+            borders.append((cluster, (cluster_x + 1, cluster_y)))
+        if cluster_y > 0:
+            borders.append(((cluster_x, cluster_y - 1), cluster))
+        if cluster_y < self.n_clusters_y - 1:
+            borders.append((cluster, (cluster_x, cluster_y + 1)))
+
+        return borders
+
+    def _find_border_links(self, border: Border) -> List[Tuple[Cell, Cell]]:
+        """Return the transitions across a border."""
+        first, second = border
+        minimum, maximum = self._cluster_area(first)
+        walkable = self.pathfinder.is_walkable
+
+        # Pairs of cells facing each other across the border
+        if second[0] != first[0]:
+            pairs = [
+                ((maximum.x, y), (maximum.x + 1, y)) 
+                for y in range(minimum.y, maximum.y + 1)
+            ]
+        else:
+            pairs = [
+                ((x, maximum.y), (x, maximum.y + 1)) 
+                for x in range(minimum.x, maximum.x + 1)
+            ]
+
+        links = []
+        run = []
+
+        for pair in pairs + [None]:
+            if pair is not None and walkable(*pair[0]) and walkable(*pair[1]):
+                run.append(pair)
+                continue
+
+            if len(run) >= LONG_ENTRANCE_WIDTH:
+                links.extend((run[0], run[-1]))
+            elif run:
+                links.append(run[len(run) // 2])
+
+            run = []
+
+        return links
+
+    def _cluster_nodes(self, cluster: Cluster) -> Set[Cell]:
+        """Return the transition cells inside a cluster."""
+        return {
+            cell
+            for border in self._borders_of(cluster)
+            for link in self._border_links[border]
+            for cell in link
+            if self.cluster_of(*cell) == cluster
+        }
+
+    def _connect(
+        self, 
+        cell: Cell, 
+        nodes: Iterable[Cell], 
+        cluster: Cluster
+    ) -> Dict[Cell, float]:
+        """Return the costs from a cell to the nodes reachable in its cluster."""
+        costs = self.pathfinder.costs_from(
+            Point(*cell), area=self._cluster_area(cluster)
+        )
+        return {node: costs[node] for node in nodes if node in costs}
+
+    def _rebuild(self, clusters: Iterable[Cluster]) -> None:
+        """Rebuild the abstract graph for clusters (and their neighbours)."""
+        clusters = set(clusters)
+        borders = {
+            border for cluster in clusters for border in self._borders_of(cluster)
+        }
+
+        for border in borders:
+            for cell, other_cell in self._border_links.get(border, []):
+                self._partners[cell].discard(other_cell)
+                self._partners[other_cell].discard(cell)
+
+            self._border_links[border] = self._find_border_links(border)
+
+            for cell, other_cell in self._border_links[border]:
+                self._partners.setdefault(cell, set()).add(other_cell)
+                self._partners.setdefault(other_cell, set()).add(cell)
+
+        # Clusters across a rebuilt border may have gained or lost transitions
+        for cluster in clusters.union(*borders):
+            nodes = self._cluster_nodes(cluster)
+            self._intra_edges[cluster] = {
+                node: self._connect(node, nodes - {node}, cluster)
+                for node in nodes
+            }
+
+    def update_region(self, minimum: Point, maximum: Point) -> None:
+        """Rebuild the cached graph after pixels in a region have changed."""
+        first_x, first_y = self.cluster_of(max(0, minimum.x), max(0, minimum.y))
+        last_x, last_y = self.cluster_of(
+            min(self.width - 1, maximum.x), min(self.height - 1, maximum.y)
+        )
+
+        self._rebuild(
+            (cluster_x, cluster_y)
+            for cluster_x in range(first_x, last_x + 1)
+            for cluster_y in range(first_y, last_y + 1)
+        )
+
+    def _abstract_path(
+        self, 
+        start: Cell, 
+        goal: Cell,
+        start_costs: Dict[Cell, float],
+        goal_costs: Dict[Cell, float]
+    ) -> Optional[List[Cell]]:
+        """Search the abstract graph between a start and goal cell."""
+        g_costs = {start: 0.0}
+        parents: Dict[Cell, Optional[Cell]] = {start: None}
+        closed = set()
+        open_heap = [(octile_distance(goal[0] - start[0], goal[1] - start[1]), start)]
+
+        while open_heap:
+            _, node = heapq.heappop(open_heap)
+
+            if node in closed:
+                continue
+            closed.add(node)
+
+            if node == goal:
+                path = []
+                while node is not None:
+                    path.append(node)
+                    node = parents[node]
+                return path[::-1]
+
+            if node == start:
+                edges = dict(start_costs)
+            else:
+                edges = dict(self._intra_edges[self.cluster_of(*node)][node])
+
+            # The start may itself be a transition
+            for partner in self._partners.get(node, ()):
+                edges[partner] = 1.0
+
+            if node in goal_costs:
+                edges[goal] = goal_costs[node]
+
+            for next_node, cost in edges.items():
+                g_cost = g_costs[node] + cost
+
+                if next_node in closed or g_cost >= g_costs.get(next_node, math.inf):
+                    continue
+
+                g_costs[next_node] = g_cost
+                parents[next_node] = node
+                heuristic = octile_distance(goal[0] - next_node[0], goal[1] - next_node[1])
+                heapq.heappush(open_heap, (g_cost + heuristic, next_node))
+
+        return None
+
+    def find_path(self, start: Point, goal: Point) -> Optional[List[Point]]:
+        """Return the cells of a path from start to goal (inclusive).
+        
+        Paths are close to, but not always exactly, the shortest. None is
+        returned if there is no path.
+        """
+        start_cell = (start.x, start.y)
+        goal_cell = (goal.x, goal.y)
+
+        if not (
+            self.pathfinder.is_walkable(*start_cell) and 
+            self.pathfinder.is_walkable(*goal_cell)
+        ):
+            return None
+
+        start_cluster = self.cluster_of(*start_cell)
+        goal_cluster = self.cluster_of(*goal_cell)
+
+        # Nearby goals may not need the abstract graph at all
+        if start_cluster == goal_cluster:
+            path = self.pathfinder.find_path(
+                start, goal, method="jps", area=self._cluster_area(start_cluster)
+            )
+            if path is not None:
+                return path
+
+        start_costs = self._connect(
+            start_cell, self._intra_edges[start_cluster], start_cluster
+        )
+        goal_costs = self._connect(
+            goal_cell, self._intra_edges[goal_cluster], goal_cluster
+        )
+
+        nodes = self._abstract_path(start_cell, goal_cell, start_costs, goal_costs)
+        if nodes is None:
+            return None
+
+        # Refine each step of the abstract path into cells
+        path = [start]
+
+        for node, next_node in zip(nodes, nodes[1:]):
+            if self.cluster_of(*node) != self.cluster_of(*next_node):
+                path.append(Point(*next_node))
+                continue
+
+            local_path = self.pathfinder.find_path(
+                Point(*node), 
+                Point(*next_node), 
+                method="jps", 
+                area=self._cluster_area(self.cluster_of(*node))
+            )
+            path.extend(local_path[1:])
+
+        return path
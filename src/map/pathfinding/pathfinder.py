@@ -0,0 +1,445 @@
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from array import array
+from contextlib import contextmanager
+import heapq
+import math
+
+from geometry.point import Point
+from map.bitmap.clearance import ClearanceMap
+from map.bitmap.monochrome_bitmap import MonochromeBitMap
+
+SQRT_2 = math.sqrt(2)
+
+# (dx, dy) of the eight neighbouring cells
+DIRECTIONS = (
+    (1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)
+)
+
+
+def octile_distance(x_delta: int, y_delta: int) -> float:
+    """Return the cost of the shortest 8-directional move across a delta."""
+    x_delta = abs(x_delta)
+    y_delta = abs(y_delta)
+    return (x_delta + y_delta) + ((SQRT_2 - 2) * min(x_delta, y_delta))
+
+
+class Pathfinder:
+    """A* and Jump Point Search over the walkable pixels of a bitmap.
+    
+    Obstacle (black) pixels are not walkable. Moves are 8-directional, but 
+    diagonal moves can't cut the corner of an obstacle. Walkability is read
+    straight from the bitmap's packed pixel buffer, and the search arrays 
+    are allocated once and reused by every query. Given a clearance map,
+    only pixels further than unit_radius from any obstacle are walkable.
+
+    The search arrays cover the whole map unless a smaller (width, height) 
+    search_size is given, in which case every search needs an area that
+    fits within it.
+    """
+    def __init__(
+        self, 
+        bitmap: MonochromeBitMap, 
+        clearance_map: Optional[ClearanceMap]=None,
+        unit_radius: float=0,
+        search_size: Optional[Tuple[int, int]]=None
+    ):
+        self.bitmap = bitmap
+        self.clearance_map = clearance_map
+        self.unit_radius = unit_radius
+        self.width = bitmap.image_width_px
+        self.height = bitmap.image_height_px
+
+        self._search_width, self._search_height = search_size or (
+            self.width, self.height
+        )
+        n_cells = self._search_width * self._search_height
+
+        # A cell's entries are only valid while its stamp matches the current
+        # search, so nothing needs clearing between queries
+        self._g_costs = array('d', [0.0]) * n_cells
+        self._parents = array('i', [-1]) * n_cells
+        self._opened = array('I', [0]) * n_cells
+        self._closed = array('I', [0]) * n_cells
+        self._search_number = 0
+
+        # Searches can be limited to part of the map (inclusive corners); the
+        # search arrays start at the area's minimum corner
+        self._area = (0, 0, self.width - 1, self.height - 1)
+        self._origin = (0, 0)
+
+    def is_walkable(self, x: int, y: int) -> bool:
+        """Check whether a pixel is inside the search area and not an obstacle."""
+        min_x, min_y, max_x, max_y = self._area
+        if not (min_x <= x <= max_x and min_y <= y <= max_y):
+            return False
+
+        if self.clearance_map is not None:
+            return self.clearance_map.has_clearance(x, y, self.unit_radius)
+
+        byte = self.bitmap.buffer[self.bitmap.row_offsets[y] + (x >> 3)]
+        bit = 1 if byte & (128 >> (x & 7)) else 0
+        return bit != self.bitmap.obstacle_bit
+
+    def _can_move(self, x: int, y: int, dx: int, dy: int) -> bool:
+        """Check whether a single move from (x, y) is allowed."""
+        if not self.is_walkable(x + dx, y + dy):
+            return False
+
+        # Diagonal moves can't cut the corner of an obstacle
+        return not (dx and dy) or (
+            self.is_walkable(x + dx, y) and self.is_walkable(x, y + dy)
+        )
+
+    def _neighbours(
+        self, 
+        x: int, 
+        y: int, 
+        parent: Optional[Tuple[int, int]],
+        goal: Tuple[int, int]
+    ) -> Iterator[Tuple[int, int, float]]:
+        """Yield (x, y, cost) of every cell reachable in one move."""
+        for dx, dy in DIRECTIONS:
+            if self._can_move(x, y, dx, dy):
+                yield x + dx, y + dy, SQRT_2 if dx and dy else 1.0
+
+    def _pruned_directions(
+        self, 
+        x: int, 
+        y: int, 
+        parent: Optional[Tuple[int, int]]
+    ) -> List[Tuple[int, int]]:
+        """Return the directions worth exploring from a jump point."""
+        if parent is None:
+            return [
+                (dx, dy) for dx, dy in DIRECTIONS 
+                if self._can_move(x, y, dx, dy)
+            ]
+
+        walkable = self.is_walkable
+        dx = (x > parent[0]) - (x < parent[0])
+        dy = (y > parent[1]) - (y < parent[1])
+        directions = []
+
+        if dx and dy:
+            if walkable(x, y + dy):
+                directions.append((0, dy))
+            if walkable(x + dx, y):
+                directions.append((dx, 0))
+            if walkable(x, y + dy) and walkable(x + dx, y):
+                directions.append((dx, dy))
+
+        elif dx:
+            if walkable(x + dx, y):
+                directions.append((dx, 0))
+                if walkable(x, y + 1):
+                    directions.append((dx, 1))
+                if walkable(x, y - 1):
+                    directions.append((dx, -1))
+            if walkable(x, y + 1):
+                directions.append((0, 1))
+            if walkable(x, y - 1):
+                directions.append((0, -1))
+
+        else:
+            if walkable(x, y + dy):
+                directions.append((0, dy))
+                if walkable(x + 1, y):
+                    directions.append((1, dy))
+                if walkable(x - 1, y):
+                    directions.append((-1, dy))
+            if walkable(x + 1, y):
+                directions.append((1, 0))
+            if walkable(x - 1, y):
+                directions.append((-1, 0))
+
+        return directions
+
+    def _jump(
+        self, 
+        x: int, 
+        y: int, 
+        dx: int, 
+        dy: int, 
+        goal: Tuple[int, int]
+    ) -> Optional[Tuple[int, int]]:
+        """Move from (x, y) in one direction until reaching a jump point."""
+        walkable = self.is_walkable
+
+        while True:
+            if not walkable(x, y):
+                return None
+
+            if (x, y) == goal:
+                return x, y
+
+            if dx and dy:
+                # Diagonal moves stop where a straight move finds something
+                if (
+                    self._jump(x + dx, y, dx, 0, goal) is not None or 
+                    self._jump(x, y + dy, 0, dy, goal) is not None
+                ):
+                    return x, y
+
+            elif dx:
+                if (
+                    (walkable(x, y - 1) and not walkable(x - dx, y - 1)) or
+                    (walkable(x, y + 1) and not walkable(x - dx, y + 1))
+                ):
+                    return x, y
+
+            else:
+                if (
+                    (walkable(x - 1, y) and not walkable(x - 1, y - dy)) or
+                    (walkable(x + 1, y) and not walkable(x + 1, y - dy))
+                ):
+                    return x, y
+
+            if not (walkable(x + dx, y) and walkable(x, y + dy)):
+                return None
+
+            x += dx
+            y += dy
+
+    def _jump_successors(
+        self, 
+        x: int, 
+        y: int, 
+        parent: Optional[Tuple[int, int]],
+        goal: Tuple[int, int]
+    ) -> Iterator[Tuple[int, int, float]]:
+        """Yield (x, y, cost) of the jump points reachable from a cell."""
+        for dx, dy in self._pruned_directions(x, y, parent):
+            jump_point = self._jump(x + dx, y + dy, dx, dy, goal)
+
+            if jump_point is not None:
+                yield (
+                    jump_point[0], 
+                    jump_point[1], 
+                    octile_distance(jump_point[0] - x, jump_point[1] - y)
+                )
+
+    def _search(
+        self, 
+        start: Tuple[int, int], 
+        goal: Tuple[int, int],
+        successors: Callable
+    ) -> Optional[List[Tuple[int, int]]]:
+        """Run A* using the given successors; return the nodes visited."""
+        # Clear the stamps before they wrap, so old ones can't match again
+        if self._search_number == 0xFFFFFFFF:
+            self._opened = array('I', [0]) * len(self._opened)
+            self._closed = array('I', [0]) * len(self._closed)
+            self._search_number = 0
+
+        self._search_number += 1
+        search_number = self._search_number
+
+        g_costs = self._g_costs
+        parents = self._parents
+        opened = self._opened
+        closed = self._closed
+        width = self._search_width
+        origin_x, origin_y = self._origin
+
+        def index_of(x: int, y: int) -> int:
+            return ((y - origin_y) * width) + (x - origin_x)
+
+        def cell_of(index: int) -> Tuple[int, int]:
+            y, x = divmod(index, width)
+            return x + origin_x, y + origin_y
+
+        start_index = index_of(*start)
+        goal_index = index_of(*goal)
+
+        g_costs[start_index] = 0.0
+        parents[start_index] = -1
+        opened[start_index] = search_number
+        open_heap = [
+            (octile_distance(goal[0] - start[0], goal[1] - start[1]), start_index)
+        ]
+
+        while open_heap:
+            _, index = heapq.heappop(open_heap)
+
+            if closed[index] == search_number:
+                continue
+            closed[index] = search_number
+
+            if index == goal_index:
+                nodes = []
+                while index != -1:
+                    nodes.append(cell_of(index))
+                    index = parents[index]
+                return nodes[::-1]
+
+            x, y = cell_of(index)
+            parent_index = parents[index]
+            parent = None if parent_index == -1 else cell_of(parent_index)
+
+            for next_x, next_y, cost in successors(x, y, parent, goal):
+                next_index = index_of(next_x, next_y)
+
+                if closed[next_index] == search_number:
+                    continue
+
+                g_cost = g_costs[index] + cost
+
+                if (
+                    opened[next_index] == search_number and 
+                    g_cost >= g_costs[next_index]
+                ):
+                    continue
+
+                opened[next_index] = search_number
+                g_costs[next_index] = g_cost
+                parents[next_index] = index
+
+                heuristic = octile_distance(goal[0] - next_x, goal[1] - next_y)
+                heapq.heappush(open_heap, (g_cost + heuristic, next_index))
+
+        return None
+
+    def find_path(
+        self, 
+        start: Point, 
+        goal: Point, 
+        method: str="astar",
+        area: Optional[Tuple[Point, Point]]=None
+    ) -> Optional[List[Point]]:
+        """Return the cells of a shortest path from start to goal (inclusive).
+        
+        method is either "astar" or "jps" (Jump Point Search, which finds 
+        paths of the same cost while exploring far fewer cells). The path 
+        can be kept within an area given by its (minimum, maximum) corners.
+        None is returned if there is no path.
+        """
+        with self._within(area):
+            return self._find_path(start, goal, method)
+
+    @contextmanager
+    def _within(self, area: Optional[Tuple[Point, Point]]) -> Iterator[None]:
+        """Limit searches to an area given by its (minimum, maximum) corners."""
+        if area is None:
+            area = (Point(0, 0), Point(self.width - 1, self.height - 1))
+
+        minimum, maximum = area
+        min_x, min_y = max(0, minimum.x), max(0, minimum.y)
+        max_x = min(self.width - 1, maximum.x)
+        max_y = min(self.height - 1, maximum.y)
+
+        if (
+            max_x - min_x >= self._search_width or 
+            max_y - min_y >= self._search_height
+        ):
+            raise ValueError(
+                "Search area is larger than the pathfinder's search size."
+            )
+
+        self._area = (min_x, min_y, max_x, max_y)
+        self._origin = (min_x, min_y)
+
+        try:
+            yield
+        finally:
+            self._area = (0, 0, self.width - 1, self.height - 1)
+            self._origin = (0, 0)
+
+    def _find_path(
+        self, 
+        start: Point, 
+        goal: Point, 
+        method: str
+    ) -> Optional[List[Point]]:
+        if method == "astar":
+            successors = self._neighbours
+        elif method == "jps":
+            successors = self._jump_successors
+        else:
+            raise ValueError(f"Unknown pathfinding method: {method}")
+
+        start_cell = (start.x, start.y)
+        goal_cell = (goal.x, goal.y)
+
+        if not (self.is_walkable(*start_cell) and self.is_walkable(*goal_cell)):
+            return None
+
+        nodes = self._search(start_cell, goal_cell, successors)
+        if nodes is None:
+            return None
+
+        # Jump points are joined by straight or diagonal runs of cells
+        path = [Point(*nodes[0])]
+
+        for (x, y), (next_x, next_y) in zip(nodes, nodes[1:]):
+            dx = (next_x > x) - (next_x < x)
+            dy = (next_y > y) - (next_y < y)
+
+            while (x, y) != (next_x, next_y):
+                x += dx
+                y += dy
+                path.append(Point(x, y))
+
+        return path
+
+    def costs_from(
+        self, 
+        start: Point, 
+        area: Optional[Tuple[Point, Point]]=None
+    ) -> Dict[Tuple[int, int], float]:
+        """Return the cost of the shortest path to every reachable (x, y).
+        
+        A single Dijkstra search from start, which is cheaper than a path to 
+        each of many goals. It can be kept within an area (see find_path).
+        """
+        with self._within(area):
+            if not self.is_walkable(start.x, start.y):
+                return {}
+
+            costs = {}
+            open_heap = [(0.0, start.x, start.y)]
+
+            while open_heap:
+                cost, x, y = heapq.heappop(open_heap)
+
+                if (x, y) in costs:
+                    continue
+                costs[(x, y)] = cost
+
+                for next_x, next_y, move_cost in self._neighbours(x, y, None, None):
+                    if (next_x, next_y) not in costs:
+                        heapq.heappush(
+                            open_heap, (cost + move_cost, next_x, next_y)
+                        )
+
+            return costs
+
+    def find_paths(
+        self, 
+        requests: Iterable[Tuple[Point, Point]], 
+        method: str="astar"
+    ) -> List[Optional[List[Point]]]:
+        """Return a path for each of many (start, goal) pairs.
+        
+        The search arrays are shared by every query, and repeated pairs are 
+        only searched once.
+        """
+        paths: Dict[Tuple[Point, Point], Optional[List[Point]]] = {}
+        output = []
+
+        for start, goal in requests:
+            key = (start, goal)
+
+            if key not in paths:
+                paths[key] = self.find_path(start, goal, method)
+
+            output.append(paths[key])
+
+        return output
+
+
+def path_cost(path: List[Point]) -> float:
+    """Return the movement cost of a path of neighbouring cells."""
+    return sum(
+        octile_distance(next_point.x - point.x, next_point.y - point.y)
+        for point, next_point in zip(path, path[1:])
+    )
@@ -0,0 +1,105 @@
+from typing import Callable, Dict, Set
+import math
+
+# Multipliers transforming (column, row) in the first octant into each of 
+# the eight octants around the origin
+_OCTANTS = (
+    (1, 0, 0, -1, -1, 0, 0, 1),
+    (0, 1, -1, 0, 0, -1, 1, 0),
+    (0, 1, 1, 0, 0, -1, -1, 0),
+    (1, 0, 0, 1, -1, 0, 0, -1)
+)
+
+
+def visible_cells(
+    origin_x: float,
+    origin_y: float,
+    radius: float,
+    width: int,
+    height: int,
+    is_blocked: Callable[[int, int], bool]
+) -> Dict[int, Set[int]]:
+    """Return the x positions visible from an origin, grouped by row.
+    
+    Uses recursive shadowcasting: each octant is scanned row by row away 
+    from the origin, and obstacles cast shadows which are skipped rather 
+    than ray-marched, so each cell is looked at about once. Obstacles are 
+    visible themselves; cells beyond the map are treated as obstacles. An
+    origin between cells uses the cell it falls in.
+    """
+    origin_x, origin_y = math.floor(origin_x), math.floor(origin_y)
+    rows: Dict[int, Set[int]] = {}
+
+    if 0 <= origin_x < width and 0 <= origin_y < height:
+        rows[origin_y] = {origin_x}
+    radius_squared = radius ** 2
+    max_distance = math.floor(radius)
+
+    def is_opaque(x: int, y: int) -> bool:
+        return not (0 <= x < width and 0 <= y < height) or is_blocked(x, y)
+
+    def cast_light(
+        distance: int, 
+        start_slope: float, 
+        end_slope: float, 
+        xx: int, 
+        xy: int, 
+        yx: int, 
+        yy: int
+    ) -> None:
+        if start_slope < end_slope:
+            return
+
+        next_start_slope = start_slope
+
+        for distance in range(distance, max_distance + 1):
+            blocked = False
+            dy = -distance
+
+            for dx in range(-distance, 1):
+                x = origin_x + (dx * xx) + (dy * xy)
+                y = origin_y + (dx * yx) + (dy * yy)
+
+                # Slopes of the cell's left and right edges
+                left_slope = (dx - 0.5) / (dy + 0.5)
+                right_slope = (dx + 0.5) / (dy - 0.5)
+
+                if start_slope < right_slope:
+                    continue
+                if end_slope > left_slope:
+                    break
+
+                if (
+                    (dx * dx) + (dy * dy) <= radius_squared and 
+                    0 <= x < width and 0 <= y < height
+                ):
+                    rows.setdefault(y, set()).add(x)
+
+                if blocked:
+                    if is_opaque(x, y):
+                        next_start_slope = right_slope
+                    else:
+                        blocked = False
+                        start_slope = next_start_slope
+
+                elif is_opaque(x, y) and distance < max_distance:
+                    # Scan the part of the next row not shadowed by this cell
+                    blocked = True
+                    cast_light(
+                        distance + 1, start_slope, left_slope, xx, xy, yx, yy
+                    )
+                    next_start_slope = right_slope
+
+            if blocked:
+                break
+
+    for octant in range(8):
+        cast_light(
+            1, 1.0, 0.0, 
+            _OCTANTS[0][octant], 
+            _OCTANTS[1][octant], 
+            _OCTANTS[2][octant], 
+            _OCTANTS[3][octant]
+        )
+
+    return rows
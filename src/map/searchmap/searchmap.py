@@ -1,8 +1,15 @@
-from typing import List
+from __future__ import annotations
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
 import math
+import mmap
+import os
+from collections import defaultdict
 from functools import cached_property
 
 from geometry.point import Point
+from geometry.polygon import Polygon
+from map.searchmap import serialisation
+from map.searchmap.field_of_view import visible_cells
 
 class SearchMap: 
     def __init__(
@@ -10,46 +17,487 @@ class SearchMap:
         map_width_px: int,
         map_height_px: int,
         search_radius: float, 
-        map: int=0
+        map: int=0,
+        buffer: Optional[memoryview]=None
     ):
-        # TODO: make map private, getters / setters etc
-        self.map = map
+        """Create a map; buffer is optional writable storage for the tiles.
+        
+        The buffer (e.g. a view of a memory-mapped file) must be n_bytes long;
+        its existing contents are kept unless map is also given.
+        """
         self.map_width_px = map_width_px
         self.map_height_px = map_height_px
         self.search_radius = search_radius
+        self._mmap = None
+        self._allocate_tiles(buffer)
+
+        # Tiles revealed since the last call to pop_revealed_spans, as a mask
+        # per 'dirty' row (the highest bit of each mask is x=0)
+        self._newly_revealed: Dict[int, int] = {}
+
+        if map:
+            self.map = map
+
+    def _allocate_tiles(self, buffer: Optional[memoryview]=None) -> None:
+        """Allocate the storage for the tiles of the map."""
+        # Tiles are packed eight to a byte in row-major order, starting from 
+        # the top left; the first tile is the most significant bit of byte 0
+        if buffer is None:
+            self._bits = bytearray(self.n_bytes)
+            return
+
+        if len(buffer) != self.n_bytes:
+            raise ValueError(f"buffer must be exactly {self.n_bytes} bytes.")
+
+        self._bits = buffer
+
+    def _packed_bits(self) -> bytes:
+        """Return the packed tiles of the whole map."""
+        return bytes(self._bits)
+
+    def _load_packed_bits(self, data: bytes) -> None:
+        """Replace the tiles of the whole map with packed tiles."""
+        self._bits[:] = data
+        self._newly_revealed.clear()
+
+    def to_bytes(self, compress: bool=False) -> bytes:
+        """Return the map in a compact, versioned binary format.
+        
+        Tiles are stored one bit each, optionally run-length encoded.
+        """
+        data = self._packed_bits()
+        flags = 0
+
+        if compress:
+            data = serialisation.run_length_encode(data)
+            flags |= serialisation.FLAG_RUN_LENGTH_ENCODED
+
+        header = serialisation.pack_header(
+            self.map_width_px, self.map_height_px, self.search_radius, flags
+        )
+        return header + data
+
+    @classmethod
+    def from_bytes(cls, data: bytes, **kwargs) -> SearchMap:
+        """Create a map from data produced by to_bytes."""
+        width, height, search_radius, flags = serialisation.unpack_header(data)
+        data = data[serialisation.HEADER_SIZE:]
+
+        if flags & serialisation.FLAG_RUN_LENGTH_ENCODED:
+            data = serialisation.run_length_decode(data)
+
+        search_map = cls(width, height, search_radius, **kwargs)
+
+        if len(data) != search_map.n_bytes:
+            raise ValueError("Data does not match the size of the map.")
+
+        search_map._load_packed_bits(data)
+        return search_map
+
+    @classmethod
+    def open_file(
+        cls,
+        file_path: str,
+        map_width_px: Optional[int]=None,
+        map_height_px: Optional[int]=None,
+        search_radius: Optional[float]=None
+    ) -> SearchMap:
+        """Open (or create) a map stored in a memory-mapped file.
+        
+        Changes to the map are made directly to the mapped file, so saving 
+        it only requires a call to flush. Files are stored uncompressed; a 
+        new file needs the size and search radius of the map.
+        """
+        if not os.path.exists(file_path):
+            if None in (map_width_px, map_height_px, search_radius):
+                raise ValueError(
+                    "The map size and search radius are needed for a new file."
+                )
+
+            n_bytes = ((map_width_px * map_height_px) + 7) // 8
+
+            with open(file_path, 'wb') as file:
+                file.write(
+                    serialisation.pack_header(
+                        map_width_px, map_height_px, search_radius
+                    )
+                )
+                # Extending the file fills it with zeros (hidden tiles)
+                file.truncate(serialisation.HEADER_SIZE + n_bytes)
+
+        with open(file_path, 'r+b') as file:
+            mapped = mmap.mmap(file.fileno(), 0)
+
+        width, height, search_radius, flags = serialisation.unpack_header(
+            mapped[:serialisation.HEADER_SIZE]
+        )
+
+        if flags & serialisation.FLAG_RUN_LENGTH_ENCODED:
+            mapped.close()
+            raise ValueError("Compressed maps can't be memory-mapped.")
+
+        search_map = cls(
+            width, 
+            height, 
+            search_radius, 
+            buffer=memoryview(mapped)[serialisation.HEADER_SIZE:]
+        )
+        search_map._mmap = mapped
+        return search_map
+
+    def flush(self) -> None:
+        """Write changes to a memory-mapped map out to its file."""
+        if self._mmap is not None:
+            self._mmap.flush()
+
+    def close(self) -> None:
+        """Flush and close the file of a memory-mapped map."""
+        if self._mmap is not None:
+            self._mmap.flush()
+            self._bits.release()
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> SearchMap:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
 
     @cached_property
     def n_bits(self):
         return self.map_height_px * self.map_width_px
 
+    @cached_property
+    def n_bytes(self) -> int:
+        return (self.n_bits + 7) // 8
+
+    @cached_property
+    def _padding_bits(self) -> int:
+        """Return the number of unused bits at the end of the last byte."""
+        return (self.n_bytes * 8) - self.n_bits
+
+    @property
+    def map(self) -> int:
+        """Return the map as an integer; the top-left tile is the highest bit."""
+        return int.from_bytes(self._bits, byteorder='big') >> self._padding_bits
+
+    @map.setter
+    def map(self, value: int) -> None:
+        """Replace the map with the bits of an integer."""
+        self._bits[:] = (value << self._padding_bits).to_bytes(
+            self.n_bytes, byteorder='big'
+        )
+
+        # Replacing the whole map is not tracked as newly revealed tiles
+        self._newly_revealed.clear()
+
     def __str__(self) -> str:
         """Iterate through the string map to print to console."""
-        input = self.__as_str()
-        output = ""
+        return "".join(f"{row}\n" for row in self.iter_rows())
+
+    def iter_rows(
+        self, 
+        hidden: str="0", 
+        revealed: str="1", 
+        scale: int=1
+    ) -> Iterator[str]:
+        """Yield the map as strings, one row at a time.
+        
+        With a scale above 1, each scale x scale block of tiles is drawn as 
+        a single glyph, which is revealed if any tile in the block is.
+        """
+        if scale < 1:
+            raise ValueError("scale must be at least 1.")
 
-        for row in range(0, self.n_bits, self.map_width_px):
-            output += input[row:row+self.map_width_px] + "\n"
+        glyphs = str.maketrans({"0": hidden, "1": revealed})
+        row_format = f"0{self.map_width_px}b"
 
-        return output
+        for block_start in range(0, self.map_height_px, scale):
+            block_value = 0
 
-    def __as_str(self) -> str: 
-        """Return a string representation of the map."""
-        str_map_val = str(bin(self.map))[2:]
-        return str_map_val.rjust(self.n_bits, "0")
+            for y in range(
+                block_start, min(block_start + scale, self.map_height_px)
+            ):
+                block_value |= self._row_value(y)
+
+            row = format(block_value, row_format)
+
+            if scale > 1:
+                row = "".join(
+                    "1" if "1" in row[x:x + scale] else "0"
+                    for x in range(0, self.map_width_px, scale)
+                )
+
+            yield row.translate(glyphs)
+
+    def render(
+        self, 
+        output: TextIO, 
+        hidden: str="0", 
+        revealed: str="1", 
+        scale: int=1
+    ) -> None:
+        """Write the map to a file-like object, one row at a time."""
+        for row in self.iter_rows(hidden, revealed, scale):
+            output.write(row)
+            output.write("\n")
 
     def __max_grid_val(self) -> int:
         return (2**self.n_bits) - 1
 
+    def _check_bounds(self, point: Point) -> None:
+        """Raise an IndexError if the point's tile is outside the map."""
+        if not (
+            0 <= point.x < self.map_width_px and 
+            0 <= point.y < self.map_height_px
+        ):
+            raise IndexError(f"Point {point} is outside the map.")
+
+    def _bit_position(self, point: Point) -> int:
+        """Return the position of the point's tile in the packed bits."""
+        self._check_bounds(point)
+        return (self.map_width_px * point.y) + point.x
+
+    def _record_revealed(self, y: int, row_mask: int) -> None:
+        """Record newly revealed tiles (as a row mask) for row y."""
+        self._newly_revealed[y] = self._newly_revealed.get(y, 0) | row_mask
+
     def reveal(self, point: Point) -> None: 
         """Alter to map to reveal the 'tile' at the given Point position."""
-        self.map |= self.grid_binary_value(point)
+        position = self._bit_position(point)
+        bitmask = 128 >> (position & 7)
+
+        if not self._bits[position >> 3] & bitmask:
+            self._bits[position >> 3] |= bitmask
+            self._record_revealed(
+                point.y, 1 << (self.map_width_px - point.x - 1)
+            )
+
+    def clear(self, point: Point) -> None:
+        """Alter the map to hide the 'tile' at the given Point position."""
+        position = self._bit_position(point)
+        self._bits[position >> 3] &= ~(128 >> (position & 7)) & 0xFF
+        self._forget_revealed(point)
+
+    def _forget_revealed(self, point: Point) -> None:
+        """Stop tracking a tile as newly revealed."""
+        # A tile hidden again before it was synced is no longer 'new'
+        row_mask = self._newly_revealed.get(point.y, 0) & ~(
+            1 << (self.map_width_px - point.x - 1)
+        )
+
+        if row_mask:
+            self._newly_revealed[point.y] = row_mask
+        else:
+            self._newly_revealed.pop(point.y, None)
+
+    def is_revealed(self, point: Point) -> bool:
+        """Check whether the 'tile' at the given Point position is revealed."""
+        position = self._bit_position(point)
+        return bool(self._bits[position >> 3] & (128 >> (position & 7)))
+
+    def _row_value(self, y: int) -> int:
+        """Return row y as an integer; the highest bit is x=0."""
+        start = self.map_width_px * y
+        stop = start + self.map_width_px
+        end_byte = (stop + 7) >> 3
+
+        row = int.from_bytes(self._bits[start >> 3:end_byte], byteorder='big')
+        return (row >> ((end_byte * 8) - stop)) & ((1 << self.map_width_px) - 1)
+
+    def _reveal_span(self, y: int, x_start: int, x_stop: int) -> None:
+        """Reveal the tiles in row y from x_start up to (excluding) x_stop."""
+        if x_stop <= x_start:
+            return
+
+        start = (self.map_width_px * y) + x_start
+        stop = start + (x_stop - x_start)
+
+        # The span is set in a single operation over the bytes it touches
+        first_byte = start >> 3
+        end_byte = (stop + 7) >> 3
+        n_bytes = end_byte - first_byte
+
+        mask = ((1 << (stop - start)) - 1) << ((end_byte * 8) - stop)
+        current = int.from_bytes(
+            self._bits[first_byte:end_byte], byteorder='big'
+        )
+
+        revealed = mask & ~current
+        if not revealed:
+            return
+
+        self._bits[first_byte:end_byte] = (current | mask).to_bytes(
+            n_bytes, byteorder='big'
+        )
+
+        # Line the revealed bits up with the row (the bytes may overhang it)
+        shift = (self.map_width_px * (y + 1)) - (end_byte * 8)
+        self._record_revealed(
+            y, revealed << shift if shift >= 0 else revealed >> -shift
+        )
+
+    @property
+    def dirty_rows(self) -> List[int]:
+        """Return the rows with tiles revealed since the last sync."""
+        return sorted(self._newly_revealed)
+
+    def pop_revealed_spans(self) -> List[Tuple[int, int, int]]:
+        """Return and forget the tiles revealed since the last call.
+        
+        Tiles are given as (y, x_start, x_stop) spans, where x_stop is 
+        excluded; the cost depends on the number of changed rows rather 
+        than the size of the map.
+        """
+        spans = []
+
+        for y in sorted(self._newly_revealed):
+            row_mask = self._newly_revealed[y]
+
+            while row_mask:
+                # The highest set bit is the left-most revealed tile
+                run_high = row_mask.bit_length() - 1
+
+                # The highest unset bit below it marks the end of the run
+                gaps = ~row_mask & ((1 << run_high) - 1)
+                run_low = gaps.bit_length()
+
+                spans.append((
+                    y, 
+                    self.map_width_px - run_high - 1, 
+                    self.map_width_px - run_low
+                ))
+                row_mask &= (1 << run_low) - 1
+
+        self._newly_revealed.clear()
+        return spans
+
+    @cached_property
+    def _disc_spans(self) -> List[Tuple[int, int]]:
+        """Return (y offset, half width) pairs describing the search disc."""
+        spans = []
+        whole_radius = math.floor(self.search_radius)
+
+        for y_offset in range(-whole_radius, whole_radius + 1):
+            half_width = math.floor(
+                math.sqrt(max(0, self.search_radius ** 2 - y_offset ** 2))
+            )
+
+            # Guard against rounding in the square root at the disc edge
+            while math.hypot(half_width + 1, y_offset) <= self.search_radius:
+                half_width += 1
+            while math.hypot(half_width, y_offset) > self.search_radius:
+                half_width -= 1
+
+            spans.append((y_offset, half_width))
+
+        return spans
+
+    def _search_radius_spans(
+        self, 
+        centre_x: float,
+        centre_y: float
+    ) -> List[Tuple[int, int, int]]:
+        """Return (y, x_start, x_stop) spans of the disc, clipped to the map."""
+        # Centres between tiles use the tile they fall in
+        centre_x, centre_y = math.floor(centre_x), math.floor(centre_y)
+        spans = []
+
+        for y_offset, half_width in self._disc_spans:
+            y = centre_y + y_offset
+
+            if 0 <= y < self.map_height_px:
+                spans.append((
+                    y, 
+                    max(0, centre_x - half_width),
+                    min(self.map_width_px, centre_x + half_width + 1)
+                ))
+
+        return spans
 
     def reveal_radius(self, point: Point) -> None:
         """Reveal a radius around a point."""
-        for given_point in self.get_points_in_search_radius(
-            centre=point
-        ): 
-            self.reveal(given_point)
+        for y, x_start, x_stop in self._search_radius_spans(point.x, point.y):
+            self._reveal_span(y, x_start, x_stop)
+
+    def reveal_many(self, points: Iterable) -> None:
+        """Reveal the search radius around many points in a single pass.
+        
+        Points may be Point objects or (x, y) pairs, e.g. the rows of an 
+        (N, 2) numpy array. Overlapping discs are merged so that each row is
+        only updated once per run of revealed tiles.
+        """
+        centres = {
+            (math.floor(x), math.floor(y))
+            for x, y in (
+                (point.x, point.y) if isinstance(point, Point) 
+                else (point[0], point[1])
+                for point in points
+            )
+        }
+
+        spans_by_row: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+
+        for centre_x, centre_y in centres:
+            for y, x_start, x_stop in self._search_radius_spans(
+                centre_x, centre_y
+            ):
+                spans_by_row[y].append((x_start, x_stop))
+
+        for y, spans in spans_by_row.items():
+            spans.sort()
+            run_start, run_stop = spans[0]
+
+            for x_start, x_stop in spans[1:]:
+                # Overlapping (or touching) spans are merged into a single run
+                if x_start <= run_stop:
+                    run_stop = max(run_stop, x_stop)
+                    continue
+
+                self._reveal_span(y, run_start, run_stop)
+                run_start, run_stop = x_start, x_stop
+
+            self._reveal_span(y, run_start, run_stop)
+
+    def reveal_polygon(self, polygon: Polygon) -> None:
+        """Reveal every tile covered by a polygon (e.g. a room or zone)."""
+        for y, x_start, x_stop in polygon.scanline_spans(
+            self.map_width_px, self.map_height_px
+        ):
+            self._reveal_span(y, x_start, x_stop)
+
+    def reveal_field_of_view(self, point: Point, obstacles) -> None:
+        """Reveal the tiles within the search radius visible from a point.
+        
+        obstacles is anything with an is_blocked(x, y) method, such as a 
+        MonochromeBitMap of the same size as the map; tiles behind obstacles
+        stay hidden. A point between tiles uses the tile it falls in.
+        """
+        origin = Point(math.floor(point.x), math.floor(point.y))
+        self._check_bounds(origin)
+
+        rows = visible_cells(
+            origin.x, 
+            origin.y, 
+            self.search_radius, 
+            self.map_width_px, 
+            self.map_height_px,
+            obstacles.is_blocked
+        )
+
+        for y, xs in rows.items():
+            xs = sorted(xs)
+            run_start = previous = xs[0]
+
+            # Consecutive visible tiles are revealed as one span
+            for x in xs[1:]:
+                if x != previous + 1:
+                    self._reveal_span(y, run_start, previous + 1)
+                    run_start = x
+                previous = x
+
+            self._reveal_span(y, run_start, previous + 1)
 
     def invert_point(self, point: Point) -> Point:
         invert_x = (self.map_width_px - point.x) -1
@@ -68,18 +516,10 @@ class SearchMap:
         centre: Point
     ) -> List[Point]:
         """List of points within search radius of a given point."""
-        points_in_search_radius = []
-
-        min_x = max(0, math.floor(centre.x - self.search_radius))
-        max_x = min(self.map_width_px, math.ceil(centre.x + self.search_radius))
-
-        min_y = max(0, math.floor(centre.y - self.search_radius))
-        max_y = max(self.map_height_px, math.ceil(centre.y + self.search_radius))
-
-        for x_value in range(min_x, max_x): 
-            for y_value in range(min_y, max_y):
-                point = Point(x_value, y_value)
-                if centre.distance_to(point) <= self.search_radius: 
-                    points_in_search_radius.append(point)
-
-        return points_in_search_radius
\ No newline at end of file
+        return [
+            Point(x_value, y_value) 
+            for y_value, x_start, x_stop in self._search_radius_spans(
+                centre.x, centre.y
+            )
+            for x_value in range(x_start, x_stop)
+        ]
@@ -0,0 +1,131 @@
+from typing import Tuple
+import re
+import struct
+
+# A serialised map is a fixed-size header followed by the packed tiles, in the
+# same layout SearchMap uses in memory; the tiles may be run-length encoded
+MAGIC = b"GLSM"
+VERSION = 1
+
+# Flags stored in the header
+FLAG_RUN_LENGTH_ENCODED = 1
+
+# magic, version, flags, (2 padding bytes), width, height, search radius
+HEADER_FORMAT = "<4sBBxxIId"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+# Runs shorter than this are cheaper to store as literal bytes
+MIN_RUN_LENGTH = 4
+_RUN_PATTERN = re.compile(
+    rb"(.)\1{%d,}" % (MIN_RUN_LENGTH - 1), flags=re.DOTALL
+)
+
+
+def pack_header(
+    map_width_px: int, 
+    map_height_px: int, 
+    search_radius: float, 
+    flags: int=0
+) -> bytes:
+    """Return the header for a map of the given size."""
+    return struct.pack(
+        HEADER_FORMAT, 
+        MAGIC, 
+        VERSION, 
+        flags, 
+        map_width_px, 
+        map_height_px, 
+        search_radius
+    )
+
+
+def unpack_header(data: bytes) -> Tuple[int, int, float, int]:
+    """Return the width, height, search radius and flags from a header."""
+    if len(data) < HEADER_SIZE:
+        raise ValueError("Data is too short to contain a SearchMap header.")
+
+    magic, version, flags, width, height, search_radius = struct.unpack_from(
+        HEADER_FORMAT, data
+    )
+
+    if magic != MAGIC:
+        raise ValueError("Data is not a serialised SearchMap.")
+
+    if version != VERSION:
+        raise ValueError(f"Unsupported SearchMap format version: {version}")
+
+    return width, height, search_radius, flags
+
+
+def _encode_varint(value: int) -> bytes:
+    """Encode a non-negative integer in 7-bit groups (LEB128)."""
+    output = bytearray()
+
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+
+        if value:
+            output.append(byte | 0x80)
+        else:
+            output.append(byte)
+            return bytes(output)
+
+
+def _decode_varint(data: bytes, position: int) -> Tuple[int, int]:
+    """Return a decoded integer and the position following it."""
+    value = 0
+    shift = 0
+
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+
+        if not byte & 0x80:
+            return value, position
+
+
+def run_length_encode(data: bytes) -> bytes:
+    """Run-length encode data as a series of runs and literal blocks.
+    
+    Each block starts with a varint of (length << 1 | is_run); runs are 
+    followed by the repeated byte and literal blocks by their bytes.
+    """
+    output = bytearray()
+    literal_start = 0
+
+    def add_literal(stop: int) -> None:
+        if stop > literal_start:
+            output.extend(_encode_varint((stop - literal_start) << 1))
+            output.extend(data[literal_start:stop])
+
+    # Finding the runs with a regex keeps the scan out of Python code
+    for run in _RUN_PATTERN.finditer(data):
+        add_literal(run.start())
+        output.extend(_encode_varint(((run.end() - run.start()) << 1) | 1))
+        output.append(data[run.start()])
+        literal_start = run.end()
+
+    add_literal(len(data))
+    return bytes(output)
+
+
+def run_length_decode(data: bytes) -> bytes:
+    """Decode data produced by run_length_encode."""
+    output = bytearray()
+    position = 0
+
+    while position < len(data):
+        control, position = _decode_varint(data, position)
+        length = control >> 1
+
+        if control & 1:
+            output.extend(data[position:position + 1] * length)
+            position += 1
+        else:
+            output.extend(data[position:position + length])
+            position += length
+
+    return bytes(output)
@@ -0,0 +1,260 @@
+from typing import Dict, Optional, Set, Tuple
+from functools import cached_property
+
+from geometry.point import Point
+from map.searchmap.searchmap import SearchMap
+
+class TiledSearchMap(SearchMap):
+    """SearchMap which only allocates storage for chunks with revealed tiles.
+    
+    The map is split into square chunks of chunk_size x chunk_size tiles; a 
+    chunk is allocated the first time one of its tiles is revealed and is 
+    dropped again once all of its tiles are cleared.
+    """
+    def __init__(
+        self, 
+        map_width_px: int,
+        map_height_px: int,
+        search_radius: float, 
+        map: int=0,
+        chunk_size: int=64
+    ):
+        if chunk_size <= 0 or chunk_size % 8:
+            raise ValueError("chunk_size must be a positive multiple of 8.")
+
+        self.chunk_size = chunk_size
+        super().__init__(map_width_px, map_height_px, search_radius, map)
+
+    def _allocate_tiles(self, buffer: Optional[memoryview]=None) -> None:
+        """Start with no chunks allocated."""
+        if buffer is not None:
+            raise TypeError("TiledSearchMap does not support external buffers.")
+
+        # Each chunk is packed in row-major order, like the dense SearchMap
+        self._chunks: Dict[Tuple[int, int], bytearray] = {}
+        self._full_chunks: Set[Tuple[int, int]] = set()
+
+        # Revealed tiles per allocated chunk, kept up to date incrementally
+        self._revealed_counts: Dict[Tuple[int, int], int] = {}
+
+    @cached_property
+    def n_chunks_x(self) -> int:
+        return -(-self.map_width_px // self.chunk_size)
+
+    @cached_property
+    def n_chunks_y(self) -> int:
+        return -(-self.map_height_px // self.chunk_size)
+
+    @cached_property
+    def _chunk_row_bytes(self) -> int:
+        return self.chunk_size // 8
+
+    @property
+    def n_allocated_chunks(self) -> int:
+        return len(self._chunks)
+
+    def chunk_position(self, point: Point) -> Tuple[int, int]:
+        """Return the (chunk_x, chunk_y) of the chunk containing the point."""
+        return point.x // self.chunk_size, point.y // self.chunk_size
+
+    def is_chunk_empty(self, chunk_x: int, chunk_y: int) -> bool:
+        """Check whether a chunk has no revealed tiles."""
+        return (chunk_x, chunk_y) not in self._chunks
+
+    def is_chunk_full(self, chunk_x: int, chunk_y: int) -> bool:
+        """Check whether every tile of a chunk is revealed."""
+        return (chunk_x, chunk_y) in self._full_chunks
+
+    def _n_tiles_in_chunk(self, chunk_x: int, chunk_y: int) -> int:
+        """Return the number of tiles of a chunk which fall inside the map."""
+        width = min(
+            self.chunk_size, self.map_width_px - (chunk_x * self.chunk_size)
+        )
+        height = min(
+            self.chunk_size, self.map_height_px - (chunk_y * self.chunk_size)
+        )
+        return width * height
+
+    def _add_to_count(self, key: Tuple[int, int], n_tiles: int) -> None:
+        """Add to a chunk's revealed count, flagging it if now full."""
+        n_revealed = self._revealed_counts.get(key, 0) + n_tiles
+        self._revealed_counts[key] = n_revealed
+
+        if n_revealed == self._n_tiles_in_chunk(*key):
+            self._full_chunks.add(key)
+        else:
+            self._full_chunks.discard(key)
+
+    def _chunk_row_slice(self, y: int) -> slice:
+        """Return the slice of a chunk's bytes holding map row y."""
+        start = (y % self.chunk_size) * self._chunk_row_bytes
+        return slice(start, start + self._chunk_row_bytes)
+
+    @property
+    def map(self) -> int:
+        """Return the map as an integer; the top-left tile is the highest bit."""
+        value = 0
+
+        for y in range(self.map_height_px):
+            value = (value << self.map_width_px) | self._row_value(y)
+
+        return value
+
+    @map.setter
+    def map(self, value: int) -> None:
+        """Replace the map with the bits of an integer."""
+        self._allocate_tiles()
+        row_mask = (1 << self.map_width_px) - 1
+        chunk_mask = (1 << self.chunk_size) - 1
+
+        # Rows are padded out to a whole number of chunks
+        row_padding = (self.n_chunks_x * self.chunk_size) - self.map_width_px
+
+        for y in range(self.map_height_px):
+            shift = self.map_width_px * (self.map_height_px - y - 1)
+            row = ((value >> shift) & row_mask) << row_padding
+
+            for chunk_x in range(self.n_chunks_x):
+                part = (
+                    row >> (self.chunk_size * (self.n_chunks_x - chunk_x - 1))
+                ) & chunk_mask
+
+                if part:
+                    chunk = self._chunks.setdefault(
+                        (chunk_x, y // self.chunk_size), 
+                        bytearray(self._chunk_row_bytes * self.chunk_size)
+                    )
+                    chunk[self._chunk_row_slice(y)] = part.to_bytes(
+                        self._chunk_row_bytes, byteorder='big'
+                    )
+
+        for key, chunk in self._chunks.items():
+            self._add_to_count(
+                key, int.from_bytes(chunk, byteorder='big').bit_count()
+            )
+
+        self._newly_revealed.clear()
+
+    def _packed_bits(self) -> bytes:
+        """Return the packed tiles of the whole map."""
+        return (self.map << self._padding_bits).to_bytes(
+            self.n_bytes, byteorder='big'
+        )
+
+    def _load_packed_bits(self, data: bytes) -> None:
+        """Replace the tiles of the whole map with packed tiles."""
+        self.map = int.from_bytes(data, byteorder='big') >> self._padding_bits
+
+    @classmethod
+    def open_file(cls, *args, **kwargs):
+        """Memory-mapped files hold dense maps; use SearchMap.open_file."""
+        raise TypeError("TiledSearchMap can't be backed by a mapped file.")
+
+    def _row_value(self, y: int) -> int:
+        """Return row y as an integer; the highest bit is x=0."""
+        value = 0
+        chunk_y = y // self.chunk_size
+        row_slice = self._chunk_row_slice(y)
+
+        for chunk_x in range(self.n_chunks_x):
+            chunk = self._chunks.get((chunk_x, chunk_y))
+            part = (
+                int.from_bytes(chunk[row_slice], byteorder='big') if chunk 
+                else 0
+            )
+            value = (value << self.chunk_size) | part
+
+        return value >> ((self.n_chunks_x * self.chunk_size) - self.map_width_px)
+
+    def _reveal_span(self, y: int, x_start: int, x_stop: int) -> None:
+        """Reveal the tiles in row y from x_start up to (excluding) x_stop."""
+        if x_stop <= x_start:
+            return
+
+        chunk_y = y // self.chunk_size
+        row_slice = self._chunk_row_slice(y)
+
+        for chunk_x in range(
+            x_start // self.chunk_size, ((x_stop - 1) // self.chunk_size) + 1
+        ):
+            key = (chunk_x, chunk_y)
+            if key in self._full_chunks:
+                continue
+
+            chunk_start = chunk_x * self.chunk_size
+            local_start = max(x_start, chunk_start) - chunk_start
+            local_stop = min(x_stop, chunk_start + self.chunk_size) - chunk_start
+
+            chunk = self._chunks.get(key)
+            if chunk is None:
+                chunk = self._chunks[key] = bytearray(
+                    self._chunk_row_bytes * self.chunk_size
+                )
+
+            mask = (
+                ((1 << (local_stop - local_start)) - 1) << 
+                (self.chunk_size - local_stop)
+            )
+            current = int.from_bytes(chunk[row_slice], byteorder='big')
+
+            revealed = mask & ~current
+            if not revealed:
+                continue
+
+            chunk[row_slice] = (current | mask).to_bytes(
+                self._chunk_row_bytes, byteorder='big'
+            )
+            self._add_to_count(key, revealed.bit_count())
+
+            # Line the revealed bits up with the map row
+            shift = self.map_width_px - chunk_start - self.chunk_size
+            self._record_revealed(
+                y, revealed << shift if shift >= 0 else revealed >> -shift
+            )
+
+    def reveal(self, point: Point) -> None: 
+        """Alter to map to reveal the 'tile' at the given Point position."""
+        self._check_bounds(point)
+        self._reveal_span(point.y, point.x, point.x + 1)
+
+    def clear(self, point: Point) -> None:
+        """Alter the map to hide the 'tile' at the given Point position."""
+        self._check_bounds(point)
+        key = self.chunk_position(point)
+        chunk = self._chunks.get(key)
+
+        if chunk is None:
+            return
+
+        local_x = point.x % self.chunk_size
+        index = self._chunk_row_slice(point.y).start + (local_x >> 3)
+        bitmask = 128 >> (local_x & 7)
+
+        if not chunk[index] & bitmask:
+            return
+
+        chunk[index] &= ~bitmask & 0xFF
+        self._add_to_count(key, -1)
+
+        # Chunks without any revealed tiles are released
+        if not self._revealed_counts[key]:
+            del self._chunks[key]
+            del self._revealed_counts[key]
+
+        self._forget_revealed(point)
+
+    def is_revealed(self, point: Point) -> bool:
+        """Check whether the 'tile' at the given Point position is revealed."""
+        self._check_bounds(point)
+        key = self.chunk_position(point)
+
+        if key in self._full_chunks:
+            return True
+
+        chunk = self._chunks.get(key)
+        if chunk is None:
+            return False
+
+        local_x = point.x % self.chunk_size
+        index = self._chunk_row_slice(point.y).start + (local_x >> 3)
+        return bool(chunk[index] & (128 >> (local_x & 7)))
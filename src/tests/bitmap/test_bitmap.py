@@ -1,5 +1,8 @@
+import struct
+
 import pytest
 
+from geometry.point import Point
 from map.bitmap.bitmap import BitMap
 from map.bitmap.monochrome_bitmap import MonochromeBitMap
 
@@ -9,6 +12,15 @@ def monochrome_bitmap():
         image_file_path='src/tests/bitmap/test_files/1bpp-321x240.bmp'
     )
 
+@pytest.fixture
+def mapped_monochrome_bitmap():
+    bitmap = MonochromeBitMap(
+        image_file_path='src/tests/bitmap/test_files/1bpp-321x240.bmp',
+        use_mmap=True
+    )
+    yield bitmap
+    bitmap.close()
+
 @pytest.fixture
 def colour_bitmap():
     return BitMap(
@@ -18,6 +30,12 @@ def colour_bitmap():
 def test_bmp_header(monochrome_bitmap):
     assert monochrome_bitmap.file_header == "BM"
 
+def test_file_size_in_bytes(monochrome_bitmap, colour_bitmap):
+    assert (
+        monochrome_bitmap.file_size_in_bytes == 10_622 and
+        colour_bitmap.file_size_in_bytes == 120_054
+    )
+
 def test_bits_per_pixel(monochrome_bitmap):
     assert monochrome_bitmap.bits_per_pixel == 1
 
@@ -49,4 +67,181 @@ def test_query_pixel_colour(monochrome_bitmap):
     ]
 
     # If we're right about all the pixels, the test will pass
-    assert all([*whites, *blacks])
\ No newline at end of file
+    assert all([*whites, *blacks])
+
+def test_query_pixel_bit(monochrome_bitmap):
+    assert (
+        monochrome_bitmap.query_pixel_bit(8, 4) == 1 and
+        monochrome_bitmap.query_pixel_bit(0, 0) == 0
+    )
+
+def test_query_pixels(monochrome_bitmap):
+    xs = [8, 8, 0, 5]
+    ys = [4, 9, 0, 0]
+
+    assert monochrome_bitmap.query_pixels(xs, ys) == [
+        monochrome_bitmap.query_pixel_colour(x, y) for x, y in zip(xs, ys)
+    ]
+
+def test_query_pixels_unequal_lengths(monochrome_bitmap):
+    with pytest.raises(ValueError):
+        monochrome_bitmap.query_pixels([1, 2], [1])
+
+@pytest.mark.parametrize("x, y", [(352, 5), (321, 0), (-1, 5), (3, 240), (3, -1)])
+def test_query_pixel_out_of_bounds(monochrome_bitmap, x, y):
+    with pytest.raises(IndexError):
+        monochrome_bitmap.query_pixel_bit(x, y)
+
+    with pytest.raises(IndexError):
+        monochrome_bitmap.query_pixels([0, x], [0, y])
+
+    with pytest.raises(IndexError):
+        monochrome_bitmap.set_pixel_bit(x, y, 1)
+
+def test_to_ndarray_indices(monochrome_bitmap):
+    pytest.importorskip("numpy")
+    pixels = monochrome_bitmap.to_ndarray()
+
+    assert (
+        pixels.shape == (240, 321) and
+        pixels[4, 8] == monochrome_bitmap.query_pixel_bit(8, 4) == 1 and
+        not pixels[0, :10].any()
+    )
+
+def test_to_ndarray_rgb(monochrome_bitmap):
+    pytest.importorskip("numpy")
+    pixels = monochrome_bitmap.to_ndarray(rgb=True)
+
+    assert (
+        pixels.shape == (240, 321, 3) and
+        tuple(pixels[4, 8]) == (255, 255, 255) and
+        tuple(pixels[0, 0]) == (0, 0, 0)
+    )
+
+def test_to_ndarray_24_bpp(colour_bitmap):
+    pytest.importorskip("numpy")
+    pixels = colour_bitmap.to_ndarray()
+    blue, green, red = colour_bitmap.get_pixel_row(0)[:3]
+
+    assert (
+        pixels.shape == (200, 200, 3) and 
+        tuple(pixels[0, 0]) == (red, green, blue)
+    )
+
+@pytest.fixture
+def paletted_bitmap(tmp_path):
+    """Write a 3x2 8-bpp BMP whose header leaves the colour count as 0."""
+    colour_table = b"".join(
+        bytes((colour, 255 - colour, colour // 2, 0)) for colour in range(256)
+    )
+    pixel_data = bytes((7, 8, 9, 0)) + bytes((200, 255, 0, 0))
+    image_data_offset = 14 + 40 + len(colour_table)
+
+    bmp_header = struct.pack(
+        "<2sIHHI", 
+        b"BM", 
+        image_data_offset + len(pixel_data), 
+        0, 
+        0, 
+        image_data_offset
+    )
+    dib_header = struct.pack(
+        "<IiiHHIIiiII", 40, 3, 2, 1, 8, 0, len(pixel_data), 0, 0, 0, 0
+    )
+
+    file_path = tmp_path / "paletted.bmp"
+    file_path.write_bytes(bmp_header + dib_header + colour_table + pixel_data)
+    return BitMap(image_file_path=str(file_path))
+
+def test_full_palette_when_colour_count_is_0(paletted_bitmap):
+    assert (
+        paletted_bitmap.n_colours_in_palette == 0 and
+        len(paletted_bitmap.colour_table) == 256 and
+        paletted_bitmap.colour_table[200].rgb == (100, 55, 200)
+    )
+
+def test_to_ndarray_rgb_8_bpp(paletted_bitmap):
+    pytest.importorskip("numpy")
+    pixels = paletted_bitmap.to_ndarray(rgb=True)
+
+    # The bottom row is stored first
+    assert (
+        pixels.shape == (2, 3, 3) and
+        tuple(pixels[0, 0]) == (100, 55, 200) and
+        tuple(pixels[1, 2]) == (4, 246, 9)
+    )
+
+def test_mapped_headers(monochrome_bitmap, mapped_monochrome_bitmap):
+    assert (
+        mapped_monochrome_bitmap.file_header == "BM" and
+        mapped_monochrome_bitmap.image_width_px == 321 and
+        mapped_monochrome_bitmap.image_height_px == 240 and
+        mapped_monochrome_bitmap.dib_header == monochrome_bitmap.dib_header
+    )
+
+def test_mapped_pixel_array(monochrome_bitmap, mapped_monochrome_bitmap):
+    rows = mapped_monochrome_bitmap.get_pixel_array()
+    
+    # Rows are views onto the mapped file rather than copies
+    assert (
+        all(isinstance(row, memoryview) for row in rows) and
+        rows == monochrome_bitmap.get_pixel_array()
+    )
+
+    for row in rows:
+        row.release()
+
+def test_close_with_live_row_view(mapped_monochrome_bitmap):
+    row = mapped_monochrome_bitmap.get_pixel_row(0)
+
+    with pytest.raises(BufferError):
+        mapped_monochrome_bitmap.close()
+
+    # Still open and readable until the row view is released
+    assert mapped_monochrome_bitmap.query_pixel_bit(0, 0) in (0, 1)
+    row.release()
+    mapped_monochrome_bitmap.close()
+
+@pytest.fixture
+def walled_bitmap(make_monochrome_bitmap):
+    return make_monochrome_bitmap([
+        "..........",
+        "....#.....",
+        "....#.....",
+        "....#.....",
+        "..........",
+    ])
+
+def test_generated_bitmap(walled_bitmap):
+    assert (
+        walled_bitmap.image_width_px == 10 and
+        walled_bitmap.obstacle_bit == 0 and
+        walled_bitmap.is_blocked(4, 2) and
+        not walled_bitmap.is_blocked(5, 2)
+    )
+
+def test_has_line_of_sight(walled_bitmap):
+    assert (
+        not walled_bitmap.has_line_of_sight(Point(1, 2), Point(8, 2)) and
+        walled_bitmap.has_line_of_sight(Point(1, 0), Point(8, 0)) and
+        walled_bitmap.has_line_of_sight(Point(1, 4), Point(8, 4)) and
+        walled_bitmap.has_line_of_sight(Point(4, 2), Point(4, 2))
+    )
+
+@pytest.mark.parametrize("origin", [Point(-20, 3), Point(10, 0), Point(3, 5)])
+def test_line_of_sight_off_map(walled_bitmap, origin):
+    with pytest.raises(IndexError):
+        walled_bitmap.has_line_of_sight(origin, Point(5, 3))
+
+    with pytest.raises(IndexError):
+        walled_bitmap.has_line_of_sight(Point(5, 3), origin)
+
+def test_line_of_sight_ignores_end_points(walled_bitmap):
+    # Looking at the wall itself is not blocked by the wall
+    assert walled_bitmap.has_line_of_sight(Point(0, 2), Point(4, 2))
+
+def test_visible_targets(walled_bitmap):
+    targets = [Point(8, 2), Point(2, 0), Point(8, 2), Point(3, 3)]
+    assert walled_bitmap.visible_targets(Point(1, 2), targets) == [
+        False, True, False, True
+    ]
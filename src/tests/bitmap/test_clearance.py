@@ -0,0 +1,56 @@
+import math
+import os
+
+import pytest
+
+from map.bitmap.clearance import CACHE_SUFFIX, ClearanceMap, squared_distances_1d
+
+@pytest.fixture
+def random_bitmap(make_random_bitmap):
+    return make_random_bitmap(30, 20, density=0.05, seed=4)
+
+def test_squared_distances_1d():
+    values = [1e20, 0.0, 1e20, 1e20, 1e20, 0.0, 1e20]
+    assert squared_distances_1d(values) == [1, 0, 1, 4, 1, 0, 1]
+
+def test_from_bitmap(random_bitmap):
+    clearance_map = ClearanceMap.from_bitmap(random_bitmap)
+    obstacles = [
+        (x, y) for y in range(20) for x in range(30) 
+        if random_bitmap.is_blocked(x, y)
+    ]
+
+    for y in range(20):
+        for x in range(30):
+            expected = min(
+                math.hypot(x - obstacle_x, y - obstacle_y) 
+                for obstacle_x, obstacle_y in obstacles
+            )
+            assert clearance_map.clearance(x, y) == pytest.approx(expected)
+
+def test_no_obstacles(make_monochrome_bitmap):
+    clearance_map = ClearanceMap.from_bitmap(make_monochrome_bitmap(["...."]))
+    assert clearance_map.clearance(2, 0) == math.inf
+
+def test_has_clearance(make_monochrome_bitmap):
+    clearance_map = ClearanceMap.from_bitmap(make_monochrome_bitmap(["#...."]))
+
+    assert not clearance_map.has_clearance(0, 0, 0)
+    assert clearance_map.has_clearance(3, 0, 2.5)
+    assert not clearance_map.has_clearance(2, 0, 2.5)
+
+def test_for_bitmap_cache(random_bitmap):
+    cache_path = random_bitmap.image_file_path + CACHE_SUFFIX
+    clearance_map = ClearanceMap.for_bitmap(random_bitmap)
+
+    assert os.path.exists(cache_path)
+    assert ClearanceMap.for_bitmap(random_bitmap).distances == clearance_map.distances
+
+    # The cache is only reused for the file it was made from
+    source = os.stat(random_bitmap.image_file_path)
+    with open(cache_path, 'rb') as cache:
+        data = cache.read()
+
+    assert ClearanceMap.from_bytes(data, source.st_size, source.st_mtime_ns)
+    assert ClearanceMap.from_bytes(data, source.st_size, source.st_mtime_ns + 1) is None
+    assert ClearanceMap.from_bytes(data[:-8], source.st_size, source.st_mtime_ns) is None
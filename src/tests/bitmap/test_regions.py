@@ -0,0 +1,82 @@
+import pytest
+
+from geometry.point import Point
+from map.bitmap.regions import NO_REGION, RegionIndex
+
+@pytest.fixture
+def rooms(make_monochrome_bitmap):
+    return make_monochrome_bitmap([
+        "..........",
+        ".####.###.",
+        ".#..#.#.#.",
+        ".####.###.",
+        "..........",
+        "####.#....",
+        "...#.#....",
+    ])
+
+@pytest.fixture
+def random_bitmap(make_random_bitmap):
+    return make_random_bitmap(37, 25, density=0.4, seed=6)
+
+def flood_fill(bitmap, start):
+    """Return the walkable pixels 4-connected to start."""
+    width, height = bitmap.image_width_px, bitmap.image_height_px
+    seen = {start}
+    stack = [start]
+
+    while stack:
+        x, y = stack.pop()
+        for next_x, next_y in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if (
+                0 <= next_x < width and 0 <= next_y < height and
+                (next_x, next_y) not in seen and 
+                not bitmap.is_blocked(next_x, next_y)
+            ):
+                seen.add((next_x, next_y))
+                stack.append((next_x, next_y))
+
+    return seen
+
+def test_regions(rooms):
+    index = RegionIndex(rooms)
+
+    assert len(index.regions) == 4
+    assert index.region_at(Point(1, 1)) is None
+    assert index.label_at(1, 1) == NO_REGION
+    assert index.labels.itemsize == 4
+
+    room = index.region_at(Point(2, 2))
+    assert room.area == 2
+    assert room.bounding_box == (Point(2, 2), Point(3, 2))
+
+    # The bottom-left corner only meets the rest of the map diagonally
+    assert index.region_at(Point(0, 6)).area == 3
+    assert not index.same_region(Point(0, 6), Point(4, 6))
+    assert index.same_region(Point(0, 0), Point(9, 6))
+
+def test_enclosed_regions(rooms):
+    enclosed = RegionIndex(rooms).enclosed_regions()
+    assert {region.minimum for region in enclosed} == {Point(2, 2), Point(7, 2)}
+
+def test_matches_flood_fill(random_bitmap):
+    index = RegionIndex(random_bitmap)
+    unvisited = {
+        (x, y) for y in range(25) for x in range(37)
+        if not random_bitmap.is_blocked(x, y)
+    }
+
+    assert sum(region.area for region in index.regions) == len(unvisited)
+
+    while unvisited:
+        start = min(unvisited, key=lambda cell: (cell[1], cell[0]))
+        cells = flood_fill(random_bitmap, start)
+        unvisited -= cells
+
+        region = index.region_at(Point(*start))
+        assert region.area == len(cells)
+        assert {index.label_at(x, y) for x, y in cells} == {region.label}
+        assert region.bounding_box == (
+            Point(min(x for x, _ in cells), min(y for _, y in cells)),
+            Point(max(x for x, _ in cells), max(y for _, y in cells))
+        )
@@ -0,0 +1,92 @@
+import random
+import struct
+
+import pytest
+
+from map.bitmap.monochrome_bitmap import MonochromeBitMap
+
+@pytest.fixture
+def make_monochrome_bitmap(tmp_path):
+    """Return a function writing rows of '#' (black) and '.' to a 1-bpp BMP."""
+    def make(rows, name="map.bmp"):
+        width = len(rows[0])
+        height = len(rows)
+        row_width = ((width + 31) // 32) * 4
+
+        pixel_data = b""
+
+        # Rows are stored bottom row first, each padded to four bytes
+        for row in reversed(rows):
+            bits = int("".join("0" if char == "#" else "1" for char in row), 2)
+            padded = bits << ((row_width * 8) - width)
+            pixel_data += padded.to_bytes(row_width, byteorder='big')
+
+        colour_table = b"\x00\x00\x00\x00" + b"\xff\xff\xff\x00"
+        image_data_offset = 14 + 40 + len(colour_table)
+
+        bmp_header = struct.pack(
+            "<2sIHHI", 
+            b"BM", 
+            image_data_offset + len(pixel_data), 
+            0, 
+            0, 
+            image_data_offset
+        )
+        dib_header = struct.pack(
+            "<IiiHHIIiiII", 
+            40, width, height, 1, 1, 0, len(pixel_data), 0, 0, 2, 0
+        )
+
+        file_path = tmp_path / name
+        file_path.write_bytes(
+            bmp_header + dib_header + colour_table + pixel_data
+        )
+        return MonochromeBitMap(image_file_path=str(file_path))
+
+    return make
+
+@pytest.fixture
+def make_random_bitmap(make_monochrome_bitmap):
+    """Return a function writing a seeded random map of obstacles."""
+    def make(width, height, density, seed, name="random.bmp"):
+        generator = random.Random(seed)
+        rows = [
+            "".join(
+                "#" if generator.random() < density else "." 
+                for _ in range(width)
+            )
+            for _ in range(height)
+        ]
+        return make_monochrome_bitmap(rows, name=name)
+
+    return make
+
+@pytest.fixture
+def maze(make_monochrome_bitmap):
+    return make_monochrome_bitmap([
+        "..........",
+        ".######.#.",
+        ".#......#.",
+        ".#.####.#.",
+        ".#.#..#...",
+        "...#.##.#.",
+        "####....#.",
+    ])
+
+@pytest.fixture
+def assert_valid_path():
+    """Return a function checking a path is connected and walkable."""
+    def check(pathfinder, path, start, goal):
+        assert path[0] == start and path[-1] == goal
+
+        for point, next_point in zip(path, path[1:]):
+            dx, dy = next_point.x - point.x, next_point.y - point.y
+            assert max(abs(dx), abs(dy)) == 1
+            assert pathfinder.is_walkable(next_point.x, next_point.y)
+
+            # Diagonal moves can't cut the corner of an obstacle
+            if dx and dy:
+                assert pathfinder.is_walkable(point.x + dx, point.y)
+                assert pathfinder.is_walkable(point.x, point.y + dy)
+
+    return check
@@ -0,0 +1,50 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from geometry.point import Point
+from geometry.point_array import PointArray
+from geometry.distance import (
+    distances_from, 
+    distance_matrix, 
+    indices_within_radius, 
+    k_nearest_indices
+)
+
+@pytest.fixture
+def points():
+    return [Point(0, 0), Point(3, 4), Point(-6, 8), Point(1, 1)]
+
+def test_distances_from(points):
+    origin = Point(1, 2)
+    assert distances_from(origin, points) == pytest.approx(
+        [origin.distance_to(point) for point in points]
+    )
+
+def test_distances_from_squared(points):
+    assert list(distances_from(Point(0, 0), points, squared=True)) == [
+        0, 25, 100, 2
+    ]
+
+def test_input_types(points):
+    origin = Point(2, -1)
+    expected = distances_from(origin, points)
+    as_array = np.array([(point.x, point.y) for point in points])
+
+    assert (
+        distances_from(origin, PointArray.from_points(points)) == 
+        pytest.approx(expected) and
+        distances_from(origin, as_array) == pytest.approx(expected)
+    )
+
+def test_distance_matrix(points):
+    matrix = distance_matrix(points, points[:2])
+    assert matrix.shape == (4, 2) and matrix[2, 1] == pytest.approx(
+        points[2].distance_to(points[1])
+    )
+
+def test_indices_within_radius(points):
+    assert list(indices_within_radius(Point(0, 0), points, 5)) == [0, 1, 3]
+
+def test_k_nearest_indices(points):
+    assert list(k_nearest_indices(Point(3, 3), points, 3)) == [1, 3, 0]
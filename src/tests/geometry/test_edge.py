@@ -128,13 +128,78 @@ def test_equals(
         short_diagonal_edge != long_diagonal_edge
     )
 
-def test_interpolate():
-    # TODO: write this test
-    assert True
+def test_interpolate(short_diagonal_edge):
+    assert (
+        short_diagonal_edge.interpolate(2, 8, 0.5) == 5 and
+        short_diagonal_edge.interpolate(4, 16, 0.25) == 7
+    )
+
+def test_intermediary_points(short_diagonal_edge, horizontal_edge):
+    points = short_diagonal_edge.intermediary_points()
+
+    assert (
+        len(points) == short_diagonal_edge.diagonal_distance + 1 and
+        points[0] == short_diagonal_edge.origin and
+        points[-1] == short_diagonal_edge.termination and
+        points[6] == Point(5, 10) and
+        len(horizontal_edge.intermediary_points()) == 1_000
+    )
+
+def test_intermediary_points_n_steps(short_diagonal_edge):
+    assert short_diagonal_edge.intermediary_points(n_steps=2) == [
+        Point(2, 4), Point(5, 10), Point(8, 16)
+    ]
+
+def test_traverse_is_connected(short_diagonal_edge_inverted):
+    cells = list(short_diagonal_edge_inverted.traverse())
+    
+    assert all(
+        max(abs(x - next_x), abs(y - next_y)) == 1
+        for (x, y), (next_x, next_y) in zip(cells, cells[1:])
+    )
+
+def test_traverse_supercover():
+    # Passing exactly through a corner touches the cells either side of it
+    edge = Edge(Point(0, 0), Point(2, 2))
+    shallow = Edge(Point(0, 0), Point(3, 1))
+
+    assert (
+        set(edge.traverse(supercover=True)) == {
+            (0, 0), (0, 1), (1, 0), (1, 1), (1, 2), (2, 1), (2, 2)
+        } and
+        set(shallow.traverse(supercover=True)) == {
+            (0, 0), (1, 0), (1, 1), (2, 0), (2, 1), (3, 1)
+        }
+    )
+
+@pytest.mark.parametrize("termination", [
+    Point(500, 999), Point(5, 5), Point(11, 7), Point(-7, 3)
+])
+def test_traverse_supercover_is_4_connected(termination):
+    edge = Edge(Point(2, 4), termination)
+    cells = list(edge.traverse(supercover=True))
 
-def test_intermediary_points():
-    # TODO: write this test
-    assert True
+    def steps(cell, other_cell):
+        return abs(cell[0] - other_cell[0]) + abs(cell[1] - other_cell[1])
+
+    assert set(edge.traverse()) <= set(cells)
+
+    for number, (cell, next_cell) in enumerate(zip(cells, cells[1:])):
+        if steps(cell, next_cell) == 1:
+            continue
+
+        # Where the edge passes exactly through a corner both cells beside 
+        # it are given; each is a single step from the cells either side
+        assert 0 < number < len(cells) - 2
+        before, after = cells[number - 1], cells[number + 2]
+        assert all(
+            steps(before, corner_cell) == 1 and steps(corner_cell, after) == 1
+            for corner_cell in (cell, next_cell)
+        )
+
+def test_coordinates(short_diagonal_edge):
+    xs, ys = short_diagonal_edge.coordinates()
+    assert list(zip(xs, ys)) == list(short_diagonal_edge.traverse())
 
 def test_orientation(
     short_diagonal_edge,
@@ -189,4 +254,28 @@ def test_points_are_collinear(
             long_diagonal_edge_skewed.termination
         )
     )
-        
\ No newline at end of file
+        
+def test_immutable(short_diagonal_edge):
+    with pytest.raises(AttributeError):
+        short_diagonal_edge.origin = Point(0, 0)
+
+def test_hash(
+    short_diagonal_edge,
+    short_diagonal_edge_duplicate,
+    short_diagonal_edge_inverted,
+    long_diagonal_edge
+):
+    assert len({
+        short_diagonal_edge,
+        short_diagonal_edge_duplicate,
+        short_diagonal_edge_inverted,
+        long_diagonal_edge
+    }) == 2
+
+def test_orientation_of_coordinates():
+    # A cross product of exactly 1 is still clockwise
+    assert (
+        Edge.orientation_of_coordinates(0, 0, 1, 0, 1, 1) == -1 and
+        Edge.orientation_of_coordinates(0, 0, 0, 1, 1, 1) == 1 and
+        Edge.orientation(Point(0, 0), Point(0, 1), Point(1, 1)) == 1
+    )
@@ -0,0 +1,87 @@
+import random
+
+import pytest
+
+from geometry.point import Point
+from geometry.edge import Edge
+from geometry import intersections
+from geometry.intersections import edges_intersect, find_intersections
+
+@pytest.fixture
+def random_edges():
+    generator = random.Random(3)
+    edges = []
+
+    for _ in range(60):
+        origin = Point(generator.randint(0, 200), generator.randint(0, 200))
+        offset = Point(generator.randint(-30, 30), generator.randint(-30, 30))
+        edges.append(Edge(origin, origin + offset))
+
+    return edges
+
+def test_find_intersections(random_edges):
+    assert find_intersections(random_edges) == [
+        (number, other_number)
+        for number, edge in enumerate(random_edges)
+        for other_number, other_edge in enumerate(random_edges)
+        if number < other_number and edge.intersects(other_edge)
+    ]
+
+def test_find_intersections_other_edges(random_edges):
+    walls, projectiles = random_edges[:40], random_edges[40:]
+    
+    assert find_intersections(projectiles, walls, cell_size=16) == [
+        (number, other_number)
+        for number, edge in enumerate(projectiles)
+        for other_number, other_edge in enumerate(walls)
+        if edge.intersects(other_edge)
+    ]
+
+def test_find_intersections_with_points():
+    edges = [
+        Edge(Point(0, 0), Point(10, 10)),
+        Edge(Point(0, 10), Point(10, 0)),
+        Edge(Point(20, 20), Point(30, 20))
+    ]
+
+    assert find_intersections(edges, with_points=True) == [
+        (0, 1, Point(5, 5))
+    ]
+
+def test_find_intersections_collinear():
+    edges = [
+        Edge(Point(0, 0), Point(10, 0)),
+        Edge(Point(5, 0), Point(15, 0)),
+        Edge(Point(15, 0), Point(20, 0)),
+        Edge(Point(30, 0), Point(40, 0)),
+        Edge(Point(0, 5), Point(0, 9)),
+        Edge(Point(0, 9), Point(0, 12))
+    ]
+
+    assert find_intersections(edges, with_points=True) == [
+        (0, 1, None),
+        (1, 2, Point(15, 0)),
+        (4, 5, Point(0, 9))
+    ]
+
+def test_find_intersections_without_numpy(monkeypatch):
+    # A small lattice, so many edges are collinear
+    generator = random.Random(9)
+    edges = [
+        Edge(
+            Point(generator.randint(0, 6), generator.randint(0, 6)), 
+            Point(generator.randint(0, 6), generator.randint(0, 6))
+        )
+        for _ in range(40)
+    ]
+    expected = [
+        (number, other_number)
+        for number, edge in enumerate(edges)
+        for other_number, other_edge in enumerate(edges)
+        if number < other_number and edges_intersect(edge, other_edge)
+    ]
+
+    assert find_intersections(edges) == expected
+
+    monkeypatch.setattr(intersections, "np", None)
+    assert find_intersections(edges) == expected
@@ -55,4 +55,14 @@ def test_points_in_rad():
 
 def test_is_in_bounds():
     # TODO: write this test
-    assert True
\ No newline at end of file
+    assert True
+
+def test_hash(a, a_dup, b):
+    assert len({a, a_dup, b}) == 2 and {a: 1}[a_dup] == 1
+
+def test_immutable(a):
+    with pytest.raises(AttributeError):
+        a.x = 5
+
+def test_eq_other_type(a):
+    assert a != (2, 2)
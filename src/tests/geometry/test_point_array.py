@@ -0,0 +1,47 @@
+import pytest
+
+from geometry.point import Point
+from geometry.point_array import PointArray
+
+@pytest.fixture
+def points():
+    return (Point(2, 2), Point(5, 5), Point(-1, 3))
+
+@pytest.fixture
+def point_array(points):
+    return PointArray.from_points(points)
+
+def test_from_points(points, point_array):
+    assert len(point_array) == 3 and list(point_array) == list(points)
+
+def test_unequal_lengths():
+    with pytest.raises(ValueError):
+        PointArray([1, 2], [1])
+
+def test_add_point(points, point_array):
+    offset = Point(1, -1)
+    assert list(point_array + offset) == [point + offset for point in points]
+
+def test_sub_array(point_array):
+    assert list(point_array - point_array) == [Point(0, 0)] * 3
+
+def test_scaled(points, point_array):
+    assert list(point_array.scaled(2)) == [point.scaled(2) for point in points]
+
+def test_dot_product(points, point_array):
+    other = Point(3, 4)
+    assert list(point_array.dot_product(other)) == [
+        point.dot_product(other) for point in points
+    ]
+
+def test_distance_to(points, point_array):
+    other = Point(7, 7)
+    assert list(point_array.distance_to(other)) == pytest.approx(
+        [point.distance_to(other) for point in points]
+    )
+
+def test_distance_to_array(point_array):
+    reversed_array = PointArray(
+        reversed(point_array.xs), reversed(point_array.ys)
+    )
+    assert point_array.distance_to(reversed_array)[1] == 0
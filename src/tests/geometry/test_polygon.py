@@ -77,4 +77,80 @@ def test_covers_point(points_for_complex_poly):
     assert (
         my_polygon.covers_point(inside) and
         not my_polygon.covers_point(outside)
-    )
\ No newline at end of file
+    )
+
+def test_covers_point_from_points():
+    # Polygons built from points alone use the points as their outline
+    square = Polygon(Point(0, 0), Point(4, 0), Point(4, 4), Point(0, 4))
+    assert (
+        square.covers_point(Point(2, 2)) and 
+        not square.covers_point(Point(5, 2)) and
+        not square.covers_point(Point(2, -1))
+    )
+
+def test_covers_points(points_for_complex_poly):
+    my_polygon = Polygon()
+    my_polygon.edges = my_polygon.edges_from_points(*points_for_complex_poly)
+
+    points = [
+        Point(x, y) for x in range(0, 18) for y in range(0, 7)
+    ]
+
+    assert my_polygon.covers_points(points) == [
+        my_polygon.covers_point(point) for point in points
+    ]
+
+def test_bounding_box(points_for_complex_poly):
+    my_polygon = Polygon(*points_for_complex_poly)
+    assert my_polygon.bounding_box == (Point(1, 1), Point(16, 5))
+
+def test_scanline_spans(points_for_complex_poly):
+    my_polygon = Polygon()
+    my_polygon.edges = my_polygon.edges_from_points(*points_for_complex_poly)
+
+    cells = {
+        (x, y) 
+        for y, x_start, x_stop in my_polygon.scanline_spans() 
+        for x in range(x_start, x_stop)
+    }
+
+    assert cells == {
+        (x, y) for x in range(-1, 20) for y in range(-1, 8) 
+        if my_polygon.covers_point(Point(x, y))
+    }
+
+def test_scanline_spans_clipped():
+    triangle = Polygon(Point(-5, -5), Point(20, 0), Point(0, 20))
+    spans = list(triangle.scanline_spans(width=10, height=10))
+
+    assert (
+        spans[0][0] == 0 and spans[-1][0] == 9 and
+        all(0 <= x_start < x_stop <= 10 for _, x_start, x_stop in spans)
+    )
+
+def test_rasterise_into():
+    square = Polygon(Point(2, 1), Point(11, 1), Point(11, 3), Point(2, 3))
+    buffer = bytearray(2 * 4)
+    square.rasterise_into(buffer, width=12, height=4)
+
+    # Rows 1 and 2, cells 2 to 10 inclusive
+    assert buffer == bytes([0, 0, 0x3F, 0xE0, 0x3F, 0xE0, 0, 0])
+
+def test_covers_points_array(points_for_complex_poly):
+    np = pytest.importorskip("numpy")
+
+    my_polygon = Polygon()
+    my_polygon.edges = my_polygon.edges_from_points(*points_for_complex_poly)
+
+    points = [
+        Point(x / 2, y / 2) for x in range(-2, 36) for y in range(-2, 14)
+    ]
+    coordinates = np.array([(point.x, point.y) for point in points])
+
+    assert my_polygon.covers_points_array(coordinates).tolist() == [
+        my_polygon.covers_point(point) for point in points
+    ]
+    assert my_polygon.covers_points_array(points).tolist() == (
+        my_polygon.covers_points(points)
+    )
+    assert not Polygon().covers_points_array(coordinates).any()
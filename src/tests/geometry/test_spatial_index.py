@@ -0,0 +1,95 @@
+import random
+
+import pytest
+
+from geometry.point import Point
+from geometry.edge import Edge
+from geometry.polygon import Polygon
+from geometry.spatial_index import QuadTree, SpatialIndex, UniformGrid
+from map.searchmap.searchmap import SearchMap
+
+@pytest.fixture(params=["grid", "quadtree"])
+def index(request):
+    if request.param == "grid":
+        return UniformGrid(cell_size=10)
+    return QuadTree(Point(0, 0), Point(100, 100), capacity=4)
+
+@pytest.fixture
+def random_points():
+    generator = random.Random(7)
+    return [
+        Point(generator.randint(0, 100), generator.randint(0, 100)) 
+        for _ in range(200)
+    ]
+
+def test_query_radius(index, random_points):
+    for number, point in enumerate(random_points):
+        index.insert(number, point)
+
+    centre = Point(40, 60)
+    assert index.query_radius(centre, 15) == {
+        number for number, point in enumerate(random_points)
+        if centre.distance_to(point) <= 15
+    }
+
+def test_query_rect(index, random_points):
+    for point in random_points:
+        if point not in index:
+            index.insert(point)
+
+    assert index.query_rect(Point(10, 20), Point(30, 35)) == {
+        point for point in random_points 
+        if 10 <= point.x <= 30 and 20 <= point.y <= 35
+    }
+
+def test_remove_and_move(index):
+    index.insert("unit", Point(5, 5))
+    index.insert("other", Point(6, 6))
+    index.move("unit", Point(90, 90))
+    index.remove("other")
+
+    assert (
+        len(index) == 1 and
+        index.query_radius(Point(5, 5), 3) == set() and
+        index.query_radius(Point(90, 90), 1) == {"unit"}
+    )
+
+def test_edges_and_polygons(index):
+    wall = Edge(Point(0, 50), Point(100, 50))
+    room = Polygon(Point(60, 60), Point(80, 60), Point(80, 80), Point(60, 80))
+    index.insert("wall", wall)
+    index.insert("room", room)
+
+    assert (
+        index.query_radius(Point(30, 45), 5) == {"wall"} and
+        index.query_rect(Point(70, 55), Point(75, 65)) == {"room"} and
+        index.query_rect(Point(0, 0), Point(10, 10)) == set()
+    )
+
+def test_insert_twice(index):
+    index.insert("unit", Point(1, 1))
+    with pytest.raises(KeyError):
+        index.insert("unit", Point(2, 2))
+
+def test_grid_for_search_map():
+    grid = UniformGrid.for_search_map(SearchMap(10, 10, search_radius=4))
+    assert grid.cell_size == 4
+
+def test_quadtree_outside_area():
+    tree = QuadTree(Point(0, 0), Point(10, 10), capacity=1)
+    tree.insert("far", Point(50, 50))
+    tree.insert("near", Point(1, 1))
+    tree.insert("nearer", Point(2, 2))
+
+    assert tree.query_radius(Point(50, 50), 1) == {"far"}
+
+def test_incomplete_index_cannot_be_created():
+    class NoCandidates(SpatialIndex):
+        def _add(self, item, bounds):
+            pass
+
+        def _discard(self, item, bounds):
+            pass
+
+    with pytest.raises(TypeError):
+        NoCandidates()
@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from geometry.point import Point
+from map.pathfinding.flow_field import FlowField
+from map.pathfinding.pathfinder import Pathfinder
+
+@pytest.fixture
+def random_bitmap(make_random_bitmap):
+    return make_random_bitmap(25, 20, density=0.3, seed=3)
+
+def test_costs(maze):
+    field = FlowField(maze, Point(4, 4))
+
+    assert field.cost_at(4, 4) == 0
+    assert field.cost_at(4, 5) == 10
+    assert field.cost_at(0, 0) == 180
+    assert field.cost_at(1, 1) is None and field.cost_at(2, 6) is None
+
+    # Costs are stored compactly, four bytes per cell
+    assert field.costs.itemsize == 4
+
+def test_next_step(maze):
+    field = FlowField(maze, Point(4, 4))
+
+    assert field.next_step(Point(4, 5)) == Point(4, 4)
+    assert field.direction_at(4, 5) == (0, -1)
+    assert field.next_step(Point(4, 4)) is None
+    assert field.next_step(Point(2, 6)) is None
+
+def test_path_from(random_bitmap, assert_valid_path):
+    goal = Point(12, 10)
+    field = FlowField(random_bitmap, goal)
+    pathfinder = Pathfinder(random_bitmap)
+
+    for y in range(20):
+        for x in range(25):
+            path = field.path_from(Point(x, y))
+            expected = pathfinder.find_path(Point(x, y), goal)
+
+            assert (path is None) == (expected is None)
+            if path is None:
+                continue
+
+            assert_valid_path(pathfinder, path, Point(x, y), goal)
+
+def test_update_region(random_bitmap):
+    goal = Point(12, 10)
+    field = FlowField(random_bitmap, goal)
+    generator = random.Random(8)
+
+    for _ in range(10):
+        x, y = generator.randrange(23), generator.randrange(18)
+
+        for dx in range(3):
+            for dy in range(3):
+                random_bitmap.set_pixel_bit(x + dx, y + dy, generator.randrange(2))
+
+        field.update_region(Point(x, y), Point(x + 2, y + 2))
+
+        assert field.costs == FlowField(random_bitmap, goal).costs
@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+from geometry.point import Point
+from map.pathfinding.hierarchical import HierarchicalPathfinder
+from map.pathfinding.pathfinder import Pathfinder
+
+@pytest.fixture
+def random_bitmap(make_random_bitmap):
+    return make_random_bitmap(40, 30, density=0.25, seed=5)
+
+@pytest.fixture
+def corridor(make_monochrome_bitmap):
+    return make_monochrome_bitmap([
+        "................",
+        "#######.########",
+        "................",
+        "................",
+    ])
+
+def test_find_path_matches_reachability(random_bitmap, assert_valid_path):
+    hierarchical = HierarchicalPathfinder(random_bitmap, cluster_size=8)
+    pathfinder = Pathfinder(random_bitmap)
+    generator = random.Random(2)
+
+    for _ in range(40):
+        start = Point(generator.randrange(40), generator.randrange(30))
+        goal = Point(generator.randrange(40), generator.randrange(30))
+
+        path = hierarchical.find_path(start, goal)
+        expected = pathfinder.find_path(start, goal)
+
+        assert (path is None) == (expected is None)
+        if path is not None:
+            assert_valid_path(pathfinder, path, start, goal)
+
+def test_update_region(corridor):
+    hierarchical = HierarchicalPathfinder(corridor, cluster_size=4)
+    start, goal = Point(0, 0), Point(0, 3)
+
+    assert Point(7, 1) in hierarchical.find_path(start, goal)
+
+    # Close the only gap in the wall
+    corridor.set_pixel_bit(7, 1, corridor.obstacle_bit)
+    hierarchical.update_region(Point(7, 1), Point(7, 1))
+    assert hierarchical.find_path(start, goal) is None
+
+    # ...and open another
+    corridor.set_pixel_bit(12, 1, 1 - corridor.obstacle_bit)
+    hierarchical.update_region(Point(12, 1), Point(12, 1))
+    assert Point(12, 1) in hierarchical.find_path(start, goal)
+
+def test_start_on_transition(make_monochrome_bitmap, assert_valid_path):
+    bitmap = make_monochrome_bitmap([
+        "........",
+        "...#....",
+        "...#....",
+        "...#....",
+    ])
+    hierarchical = HierarchicalPathfinder(bitmap, cluster_size=4)
+
+    # (3, 0) is the only way out of its cluster
+    path = hierarchical.find_path(Point(3, 0), Point(7, 3))
+    assert_valid_path(Pathfinder(bitmap), path, Point(3, 0), Point(7, 3))
@@ -0,0 +1,122 @@
+import random
+
+import pytest
+
+from geometry.point import Point
+from map.bitmap.clearance import ClearanceMap
+from map.pathfinding.pathfinder import SQRT_2, Pathfinder, path_cost
+
+@pytest.fixture
+def random_bitmap(make_random_bitmap):
+    return make_random_bitmap(30, 20, density=0.3, seed=11)
+
+@pytest.mark.parametrize("method", ["astar", "jps"])
+def test_find_path(maze, method, assert_valid_path):
+    pathfinder = Pathfinder(maze)
+    start, goal = Point(0, 0), Point(4, 4)
+    path = pathfinder.find_path(start, goal, method=method)
+
+    assert_valid_path(pathfinder, path, start, goal)
+    assert path_cost(path) == pytest.approx(18)
+
+def test_no_path(maze):
+    pathfinder = Pathfinder(maze)
+    assert (
+        pathfinder.find_path(Point(0, 0), Point(1, 1)) is None and
+        pathfinder.find_path(Point(0, 0), Point(2, 6), method="jps") is None
+    )
+
+def test_unknown_method(maze):
+    with pytest.raises(ValueError):
+        Pathfinder(maze).find_path(Point(0, 0), Point(4, 4), method="bfs")
+
+def test_jps_matches_astar(random_bitmap, assert_valid_path):
+    pathfinder = Pathfinder(random_bitmap)
+    generator = random.Random(5)
+    cells = [
+        Point(x, y) for x in range(30) for y in range(20) 
+        if pathfinder.is_walkable(x, y)
+    ]
+
+    for _ in range(40):
+        start, goal = generator.sample(cells, 2)
+        astar = pathfinder.find_path(start, goal, method="astar")
+        jps = pathfinder.find_path(start, goal, method="jps")
+
+        if astar is None:
+            assert jps is None
+            continue
+
+        assert_valid_path(pathfinder, jps, start, goal)
+        assert path_cost(jps) == pytest.approx(path_cost(astar))
+
+def test_find_paths(maze):
+    pathfinder = Pathfinder(maze)
+    requests = [
+        (Point(0, 0), Point(4, 4)), 
+        (Point(9, 6), Point(2, 2)), 
+        (Point(0, 0), Point(4, 4))
+    ]
+    paths = pathfinder.find_paths(requests, method="jps")
+
+    assert (
+        paths[0] == paths[2] == pathfinder.find_path(Point(0, 0), Point(4, 4)) 
+        and path_cost(paths[1]) == pytest.approx(
+            path_cost(pathfinder.find_path(Point(9, 6), Point(2, 2)))
+        )
+    )
+
+def test_costs_from(maze):
+    pathfinder = Pathfinder(maze)
+    costs = pathfinder.costs_from(Point(0, 0))
+
+    assert costs[(4, 4)] == pytest.approx(18)
+    assert (1, 1) not in costs and (2, 6) not in costs
+
+    # Limited to an area
+    costs = pathfinder.costs_from(Point(0, 0), area=(Point(0, 0), Point(2, 2)))
+    assert set(costs) == {(0, 0), (1, 0), (2, 0), (0, 1), (0, 2)}
+
+def test_unit_radius(make_monochrome_bitmap):
+    bitmap = make_monochrome_bitmap([
+        "...........",
+        "...........",
+        ".....#.....",
+        "...........",
+        "...........",
+        "...........",
+        "...........",
+    ])
+    clearance_map = ClearanceMap.from_bitmap(bitmap)
+    start, goal = Point(0, 2), Point(10, 2)
+
+    assert path_cost(Pathfinder(bitmap).find_path(start, goal)) == pytest.approx(
+        8 + (2 * SQRT_2)
+    )
+
+    # A wide unit has to keep more than two pixels from the obstacle
+    pathfinder = Pathfinder(bitmap, clearance_map, unit_radius=2)
+    path = pathfinder.find_path(start, goal, method="jps")
+
+    assert all(clearance_map.clearance(p.x, p.y) > 2 for p in path)
+    assert pathfinder.find_path(start, Point(4, 2)) is None
+
+def test_search_size(maze, assert_valid_path):
+    pathfinder = Pathfinder(maze, search_size=(5, 5))
+    area = (Point(2, 2), Point(6, 6))
+
+    path = pathfinder.find_path(Point(2, 4), Point(6, 2), area=area, method="jps")
+    assert_valid_path(pathfinder, path, Point(2, 4), Point(6, 2))
+    assert path_cost(path) == pytest.approx(6)
+
+    with pytest.raises(ValueError):
+        pathfinder.find_path(Point(0, 0), Point(4, 4))
+
+def test_search_number_wraps(maze):
+    pathfinder = Pathfinder(maze)
+    pathfinder.find_path(Point(0, 0), Point(4, 4))
+    pathfinder._search_number = 0xFFFFFFFF
+
+    for _ in range(2):
+        path = pathfinder.find_path(Point(0, 0), Point(4, 4))
+        assert path_cost(path) == pytest.approx(18)
@@ -0,0 +1,317 @@
+import io
+
+import pytest
+
+from geometry.point import Point
+from geometry.point_array import PointArray
+from geometry.polygon import Polygon
+from map.searchmap.field_of_view import visible_cells
+from map.searchmap.searchmap import SearchMap
+
+@pytest.fixture
+def radius_map():
+    return SearchMap(map_width_px=11, map_height_px=9, search_radius=2.5)
+
+def revealed_by_brute_force(search_map, centre):
+    """Return the set of (x, y) within the search radius of the centre."""
+    return {
+        (x, y)
+        for x in range(search_map.map_width_px)
+        for y in range(search_map.map_height_px)
+        if centre.distance_to(Point(x, y)) <= search_map.search_radius
+    }
+
+def revealed_tiles(search_map):
+    """Return the set of (x, y) revealed on the map."""
+    return {
+        (x, y)
+        for x in range(search_map.map_width_px)
+        for y in range(search_map.map_height_px)
+        if search_map.is_revealed(Point(x, y))
+    }
+
+@pytest.fixture
+def small_map():
+    return SearchMap(map_width_px=3, map_height_px=2, search_radius=1)
+
+def test_reveal(small_map):
+    small_map.reveal(Point(0, 0))
+    small_map.reveal(Point(2, 1))
+
+    assert (
+        small_map.map == 0b100001 and
+        small_map.is_revealed(Point(0, 0)) and
+        not small_map.is_revealed(Point(1, 0))
+    )
+
+def test_reveal_matches_grid_binary_value(small_map):
+    point = Point(1, 1)
+    small_map.reveal(point)
+    assert small_map.map == small_map.grid_binary_value(point)
+
+def test_clear(small_map):
+    small_map.reveal(Point(1, 0))
+    small_map.reveal(Point(2, 0))
+    small_map.clear(Point(1, 0))
+
+    assert (
+        small_map.map == 0b001000 and 
+        not small_map.is_revealed(Point(1, 0))
+    )
+
+@pytest.mark.parametrize("point", [Point(3, 0), Point(-1, 0), Point(0, 2)])
+def test_reveal_out_of_bounds(small_map, point):
+    for method in (small_map.reveal, small_map.clear, small_map.is_revealed):
+        with pytest.raises(IndexError):
+            method(point)
+
+    assert small_map.map == 0 and small_map.pop_revealed_spans() == []
+
+def test_map_setter():
+    search_map = SearchMap(3, 2, 1, map=0b010100)
+
+    assert (
+        search_map.is_revealed(Point(1, 0)) and
+        search_map.is_revealed(Point(0, 1)) and
+        search_map.map == 0b010100
+    )
+
+def test_str(small_map):
+    small_map.reveal(Point(0, 0))
+    small_map.reveal(Point(2, 1))
+    assert str(small_map) == "100\n001\n"
+
+def test_iter_rows_glyphs(small_map):
+    small_map.reveal(Point(1, 1))
+    assert list(small_map.iter_rows(hidden=".", revealed="#")) == [
+        "...", ".#."
+    ]
+
+def test_iter_rows_scaled(radius_map):
+    radius_map.reveal(Point(3, 3))
+    radius_map.reveal(Point(10, 8))
+
+    # 11 x 9 tiles are drawn as 4 x 3 blocks of up to 3 x 3 tiles
+    assert list(radius_map.iter_rows(scale=3)) == ["0000", "0100", "0001"]
+
+def test_render(small_map):
+    output = io.StringIO()
+    small_map.reveal(Point(2, 0))
+    small_map.render(output, hidden="-", revealed="x")
+    
+    assert output.getvalue() == "--x\n---\n"
+
+
+def test_reveal_radius(radius_map):
+    centre = Point(5, 4)
+    radius_map.reveal_radius(centre)
+    assert revealed_tiles(radius_map) == revealed_by_brute_force(
+        radius_map, centre
+    )
+
+def test_reveal_radius_clipped(radius_map):
+    radius_map.reveal_radius(Point(0, 8))
+    radius_map.reveal_radius(Point(10, 0))
+
+    assert revealed_tiles(radius_map) == (
+        revealed_by_brute_force(radius_map, Point(0, 8)) |
+        revealed_by_brute_force(radius_map, Point(10, 0))
+    )
+
+def test_reveal_radius_between_tiles(radius_map):
+    radius_map.reveal_radius(Point(4.5, 4.5))
+    assert revealed_tiles(radius_map) == revealed_by_brute_force(
+        radius_map, Point(4, 4)
+    )
+
+def test_points_in_search_radius(radius_map):
+    centre = Point(1, 1)
+    points = radius_map.get_points_in_search_radius(centre)
+    assert {(point.x, point.y) for point in points} == revealed_by_brute_force(
+        radius_map, centre
+    )
+
+def test_reveal_many(radius_map):
+    centres = [Point(2, 2), Point(3, 2), Point(9, 7), Point(2, 2)]
+    radius_map.reveal_many(centres)
+
+    expected = set()
+    for centre in centres:
+        expected |= revealed_by_brute_force(radius_map, centre)
+
+    assert revealed_tiles(radius_map) == expected
+
+def test_reveal_many_pairs(radius_map):
+    radius_map.reveal_many([(0, 0), (10, 8)])
+    assert revealed_tiles(radius_map) == (
+        revealed_by_brute_force(radius_map, Point(0, 0)) |
+        revealed_by_brute_force(radius_map, Point(10, 8))
+    )
+
+def test_reveal_many_point_array(radius_map):
+    radius_map.reveal_many(PointArray.from_points([Point(3, 3), Point(7.5, 2.5)]))
+    assert revealed_tiles(radius_map) == (
+        revealed_by_brute_force(radius_map, Point(3, 3)) |
+        revealed_by_brute_force(radius_map, Point(7, 2))
+    )
+
+def test_pop_revealed_spans(radius_map):
+    radius_map.reveal(Point(0, 0))
+    radius_map.reveal_radius(Point(5, 4))
+
+    spans = radius_map.pop_revealed_spans()
+    tiles = {
+        (x, y) for y, x_start, x_stop in spans for x in range(x_start, x_stop)
+    }
+
+    assert (
+        tiles == revealed_tiles(radius_map) and
+        spans[0] == (0, 0, 1) and
+        radius_map.pop_revealed_spans() == [] and
+        radius_map.dirty_rows == []
+    )
+
+def test_pop_revealed_spans_only_new(radius_map):
+    radius_map.reveal_radius(Point(5, 4))
+    radius_map.pop_revealed_spans()
+
+    # Only the column of tiles not already revealed should be reported
+    radius_map.reveal_radius(Point(6, 4))
+    new_tiles = {
+        (x, y) 
+        for y, x_start, x_stop in radius_map.pop_revealed_spans() 
+        for x in range(x_start, x_stop)
+    }
+
+    assert new_tiles == (
+        revealed_by_brute_force(radius_map, Point(6, 4)) - 
+        revealed_by_brute_force(radius_map, Point(5, 4))
+    )
+
+def test_cleared_tiles_not_reported(small_map):
+    small_map.reveal(Point(1, 0))
+    small_map.reveal(Point(2, 0))
+    small_map.clear(Point(1, 0))
+
+    assert (
+        small_map.dirty_rows == [0] and
+        small_map.pop_revealed_spans() == [(0, 2, 3)]
+    )
+
+def test_to_bytes_round_trip(radius_map):
+    radius_map.reveal_radius(Point(5, 4))
+
+    for compress in (False, True):
+        loaded = SearchMap.from_bytes(radius_map.to_bytes(compress=compress))
+        assert (
+            loaded.map == radius_map.map and
+            loaded.map_width_px == 11 and
+            loaded.map_height_px == 9 and
+            loaded.search_radius == 2.5
+        )
+
+def test_to_bytes_compressed_size():
+    search_map = SearchMap(map_width_px=512, map_height_px=512, search_radius=8)
+    search_map.reveal_radius(Point(100, 100))
+
+    assert (
+        len(search_map.to_bytes(compress=True)) < 
+        len(search_map.to_bytes()) // 50
+    )
+
+def test_from_bytes_rejects_other_data():
+    with pytest.raises(ValueError):
+        SearchMap.from_bytes(b"not a search map at all")
+
+def test_open_file(tmp_path, radius_map):
+    file_path = tmp_path / "fog.bin"
+    radius_map.reveal_radius(Point(5, 4))
+
+    with SearchMap.open_file(str(file_path), 11, 9, 2.5) as mapped_map:
+        mapped_map.reveal_radius(Point(5, 4))
+
+    with SearchMap.open_file(str(file_path)) as reopened_map:
+        reopened = reopened_map.map
+
+    assert (
+        reopened == radius_map.map and
+        file_path.read_bytes() == radius_map.to_bytes()
+    )
+
+def test_reveal_polygon(radius_map):
+    room = Polygon(Point(1, 1), Point(6, 1), Point(6, 5), Point(3, 7))
+    radius_map.reveal_polygon(room)
+
+    assert revealed_tiles(radius_map) == {
+        (x, y) 
+        for x in range(radius_map.map_width_px)
+        for y in range(radius_map.map_height_px)
+        if room.covers_point(Point(x, y))
+    }
+
+@pytest.fixture
+def walled_bitmap(make_monochrome_bitmap):
+    return make_monochrome_bitmap([
+        "...........",
+        "...........",
+        ".....#.....",
+        ".....#.....",
+        ".....#.....",
+        ".....#.....",
+        ".....#.....",
+        "...........",
+        "...........",
+    ])
+
+def test_reveal_field_of_view(walled_bitmap):
+    radius_map = SearchMap(map_width_px=11, map_height_px=9, search_radius=4)
+    radius_map.reveal_field_of_view(Point(3, 4), walled_bitmap)
+
+    assert (
+        radius_map.is_revealed(Point(3, 4)) and
+        radius_map.is_revealed(Point(5, 4)) and
+        not radius_map.is_revealed(Point(6, 4)) and
+        not radius_map.is_revealed(Point(7, 3)) and
+        radius_map.is_revealed(Point(4, 1)) and
+        # The wall only ever hides tiles, never reveals more than the disc
+        revealed_tiles(radius_map) <= revealed_by_brute_force(
+            radius_map, Point(3, 4)
+        )
+    )
+
+def test_reveal_field_of_view_open(radius_map, make_monochrome_bitmap):
+    open_bitmap = make_monochrome_bitmap(["." * 11] * 9, name="open.bmp")
+    radius_map.reveal_field_of_view(Point(5, 4), open_bitmap)
+
+    # Without obstacles the visible tiles are the plain disc
+    assert revealed_tiles(radius_map) == revealed_by_brute_force(
+        radius_map, Point(5, 4)
+    )
+
+@pytest.mark.parametrize("origin", [Point(12, 1), Point(-1, -1), Point(3, 9)])
+def test_reveal_field_of_view_off_map(walled_bitmap, origin):
+    radius_map = SearchMap(map_width_px=11, map_height_px=9, search_radius=2)
+
+    with pytest.raises(IndexError):
+        radius_map.reveal_field_of_view(origin, walled_bitmap)
+
+    assert radius_map.map == 0
+
+def test_reveal_field_of_view_between_tiles(walled_bitmap):
+    radius_map = SearchMap(map_width_px=11, map_height_px=9, search_radius=4)
+    radius_map.reveal_field_of_view(Point(3.5, 4.5), walled_bitmap)
+
+    expected = SearchMap(map_width_px=11, map_height_px=9, search_radius=4)
+    expected.reveal_field_of_view(Point(3, 4), walled_bitmap)
+
+    assert radius_map.map == expected.map != 0
+
+def test_visible_cells_off_map():
+    def is_blocked(x, y):
+        return False
+
+    # The origin itself is only included when it is on the map
+    assert visible_cells(12, 1, 2, 10, 5, is_blocked) == {}
+    assert visible_cells(10, 1, 2, 10, 5, is_blocked) == {
+        0: {9}, 1: {8, 9}, 2: {9}
+    }
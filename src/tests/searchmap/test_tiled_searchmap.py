@@ -0,0 +1,121 @@
+import random
+
+import pytest
+
+from geometry.point import Point
+from map.searchmap.searchmap import SearchMap
+from map.searchmap.tiled_searchmap import TiledSearchMap
+
+@pytest.fixture
+def tiled_map():
+    # 2.5 x 1.5 chunks, so the right and bottom chunks are partial
+    return TiledSearchMap(
+        map_width_px=20, map_height_px=12, search_radius=3, chunk_size=8
+    )
+
+@pytest.fixture
+def dense_map():
+    return SearchMap(map_width_px=20, map_height_px=12, search_radius=3)
+
+def test_chunk_size_validated():
+    with pytest.raises(ValueError):
+        TiledSearchMap(10, 10, 1, chunk_size=12)
+
+def test_starts_empty(tiled_map):
+    assert (
+        tiled_map.n_allocated_chunks == 0 and
+        tiled_map.map == 0 and
+        tiled_map.is_chunk_empty(0, 0)
+    )
+
+def test_matches_dense_map(tiled_map, dense_map):
+    for search_map in (tiled_map, dense_map):
+        search_map.reveal_radius(Point(7, 7))
+        search_map.reveal_radius(Point(19, 0))
+        search_map.reveal(Point(0, 11))
+
+    assert (
+        tiled_map.map == dense_map.map and
+        str(tiled_map) == str(dense_map) and
+        tiled_map.pop_revealed_spans() == dense_map.pop_revealed_spans()
+    )
+
+def test_reveal_out_of_bounds(tiled_map):
+    for method in (tiled_map.reveal, tiled_map.clear, tiled_map.is_revealed):
+        with pytest.raises(IndexError):
+            method(Point(20, 0))
+
+    assert tiled_map.n_allocated_chunks == 0
+
+def test_reveal_across_chunks(tiled_map):
+    tiled_map.reveal_radius(Point(8, 8))
+    
+    # The disc touches all four chunks around (8, 8), but nothing further
+    assert (
+        tiled_map.n_allocated_chunks == 4 and
+        tiled_map.is_revealed(Point(7, 7)) and
+        tiled_map.is_revealed(Point(8, 8)) and
+        tiled_map.is_chunk_empty(2, 0)
+    )
+
+def test_full_chunk(tiled_map):
+    for y in range(8, 12):
+        tiled_map._reveal_span(y, 16, 20)
+
+    assert (
+        tiled_map.is_chunk_full(2, 1) and
+        not tiled_map.is_chunk_full(1, 1) and
+        tiled_map.is_revealed(Point(19, 11))
+    )
+
+def test_clear_releases_chunk(tiled_map):
+    tiled_map.reveal(Point(3, 3))
+    tiled_map.reveal(Point(12, 3))
+    tiled_map.clear(Point(3, 3))
+
+    assert (
+        tiled_map.is_chunk_empty(0, 0) and
+        not tiled_map.is_chunk_empty(1, 0) and
+        tiled_map.pop_revealed_spans() == [(3, 12, 13)]
+    )
+
+def test_map_setter(dense_map):
+    dense_map.reveal_radius(Point(10, 5))
+    tiled_map = TiledSearchMap(20, 12, 3, map=dense_map.map, chunk_size=8)
+
+    assert (
+        tiled_map.map == dense_map.map and
+        tiled_map.n_allocated_chunks == 3
+    )
+
+def test_to_bytes_matches_dense_map(tiled_map, dense_map):
+    for search_map in (tiled_map, dense_map):
+        search_map.reveal_radius(Point(9, 6))
+
+    loaded = TiledSearchMap.from_bytes(
+        dense_map.to_bytes(compress=True), chunk_size=8
+    )
+
+    assert (
+        tiled_map.to_bytes() == dense_map.to_bytes() and
+        loaded.map == dense_map.map
+    )
+
+def test_revealed_counts(tiled_map):
+    generator = random.Random(1)
+
+    for _ in range(400):
+        point = Point(generator.randrange(20), generator.randrange(12))
+        if generator.random() < 0.7:
+            tiled_map.reveal(point)
+        else:
+            tiled_map.clear(point)
+
+    for key, chunk in tiled_map._chunks.items():
+        n_revealed = int.from_bytes(chunk, byteorder='big').bit_count()
+        assert tiled_map._revealed_counts[key] == n_revealed
+        assert tiled_map.is_chunk_full(*key) == (
+            n_revealed == tiled_map._n_tiles_in_chunk(*key)
+        )
+
+    assert set(tiled_map._revealed_counts) == set(tiled_map._chunks)